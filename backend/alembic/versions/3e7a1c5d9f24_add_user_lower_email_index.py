@@ -0,0 +1,28 @@
+"""Add a unique index on the lower-cased user email used by the registration and profile checks
+
+Revision ID: 3e7a1c5d9f24
+Revises: 9b4f3d2a6c18
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e7a1c5d9f24"
+down_revision: Union[str, None] = "9b4f3d2a6c18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Fails if two existing emails only differ by case: these accounts must be merged first
+    op.create_index("ix_user_lower_email", "user", [sa.text("lower(email)")], unique=True, if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_lower_email", table_name="user", if_exists=True)
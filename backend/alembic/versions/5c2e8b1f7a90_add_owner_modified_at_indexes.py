@@ -0,0 +1,44 @@
+"""Add owner modification date indexes used by the conditional requests
+
+Revision ID: 5c2e8b1f7a90
+Revises: d501f67ab4d5
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8b1f7a90"
+down_revision: Union[str, None] = "d501f67ab4d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OWNED_TABLES = [
+    "keyword",
+    "aggregator",
+    "company",
+    "location",
+    "file",
+    "person",
+    "job",
+    "interview",
+    "job_application_update",
+    "job_alert_email",
+    "scraped_job",
+]
+
+
+def upgrade() -> None:
+    for table_name in OWNED_TABLES:
+        op.create_index(
+            f"ix_{table_name}_owner_id_modified_at", table_name, ["owner_id", "modified_at"], if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    for table_name in OWNED_TABLES:
+        op.drop_index(f"ix_{table_name}_owner_id_modified_at", table_name=table_name, if_exists=True)
@@ -0,0 +1,40 @@
+"""Write the predicate of the pending scraped job index as the scraper queries filter the jobs
+
+Revision ID: 7d2c4e8a1b36
+Revises: 3e7a1c5d9f24
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7d2c4e8a1b36"
+down_revision: Union[str, None] = "3e7a1c5d9f24"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The planner cannot prove that "is_scraped IS false" implies "is_scraped = false", so the index was never used
+    op.drop_index("ix_scraped_job_pending", table_name="scraped_job", if_exists=True)
+    op.create_index(
+        "ix_scraped_job_pending",
+        "scraped_job",
+        ["external_job_id"],
+        postgresql_where=sa.text("is_scraped IS FALSE AND is_failed IS FALSE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scraped_job_pending", table_name="scraped_job", if_exists=True)
+    op.create_index(
+        "ix_scraped_job_pending",
+        "scraped_job",
+        ["external_job_id"],
+        postgresql_where=sa.text("is_scraped = false AND is_failed = false"),
+    )
@@ -0,0 +1,82 @@
+"""Add the tombstone table and the triggers recording the deleted entries
+
+Revision ID: 9b4f3d2a6c18
+Revises: 5c2e8b1f7a90
+Create Date: 2026-10-17 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4f3d2a6c18"
+down_revision: Union[str, None] = "5c2e8b1f7a90"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRACKED_TABLES = [
+    "setting",
+    "keyword",
+    "aggregator",
+    "company",
+    "location",
+    "file",
+    "person",
+    "job",
+    "interview",
+    "job_application_update",
+    "job_alert_email",
+    "scraped_job",
+]
+
+# Statement-level trigger function recording one tombstone per deleted row
+TOMBSTONE_FUNCTION = """
+    CREATE OR REPLACE FUNCTION record_tombstones() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO tombstone (table_name, entry_id, owner_id)
+        SELECT TG_TABLE_NAME, deleted.id, (to_jsonb(deleted) ->> 'owner_id')::integer FROM deleted;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+
+
+def upgrade() -> None:
+    op.create_table(
+        "tombstone",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.TIMESTAMP(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.Column("modified_at", sa.TIMESTAMP(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("table_name", sa.String(), nullable=False),
+        sa.Column("entry_id", sa.Integer(), nullable=False),
+        sa.Column("owner_id", sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_tombstone_table_name_owner_id_created_at",
+        "tombstone",
+        ["table_name", "owner_id", "created_at"],
+        if_not_exists=True,
+    )
+
+    op.execute(TOMBSTONE_FUNCTION)
+    for table_name in TRACKED_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS "{table_name}_tombstone" ON "{table_name}"')
+        op.execute(
+            f'CREATE TRIGGER "{table_name}_tombstone" AFTER DELETE ON "{table_name}" '
+            f"REFERENCING OLD TABLE AS deleted FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones()"
+        )
+
+
+def downgrade() -> None:
+    for table_name in TRACKED_TABLES:
+        op.execute(f'DROP TRIGGER IF EXISTS "{table_name}_tombstone" ON "{table_name}"')
+    op.execute("DROP FUNCTION IF EXISTS record_tombstones()")
+
+    op.drop_index("ix_tombstone_table_name_owner_id_created_at", table_name="tombstone", if_exists=True)
+    op.drop_table("tombstone", if_exists=True)
@@ -0,0 +1,26 @@
+"""Add the index used to delete the expired tombstones
+
+Revision ID: c41f8e2b7d05
+Revises: 7d2c4e8a1b36
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c41f8e2b7d05"
+down_revision: Union[str, None] = "7d2c4e8a1b36"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_tombstone_created_at", "tombstone", ["created_at"], if_not_exists=True)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tombstone_created_at", table_name="tombstone", if_exists=True)
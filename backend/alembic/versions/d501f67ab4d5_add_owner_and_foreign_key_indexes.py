@@ -0,0 +1,73 @@
+"""Add owner-scoped composite indexes and missing foreign key indexes
+
+Revision ID: d501f67ab4d5
+Revises:
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d501f67ab4d5"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+OWNED_TABLES = [
+    "keyword",
+    "aggregator",
+    "company",
+    "location",
+    "file",
+    "person",
+    "job",
+    "interview",
+    "job_application_update",
+    "job_alert_email",
+    "scraped_job",
+]
+
+FOREIGN_KEY_INDEXES = [
+    ("job_application_update", "job_id"),
+    ("job_alert_email", "service_log_id"),
+    ("job_keyword_mapping", "keyword_id"),
+    ("job_contact_mapping", "person_id"),
+    ("interview_interviewer_mapping", "person_id"),
+    ("email_scrapedjob_mapping", "job_id"),
+]
+
+
+def upgrade() -> None:
+    for table_name in OWNED_TABLES:
+        op.create_index(
+            f"ix_{table_name}_owner_id_created_at",
+            table_name,
+            ["owner_id", "created_at", "id"],
+            if_not_exists=True,
+        )
+
+    for table_name, column_name in FOREIGN_KEY_INDEXES:
+        op.create_index(f"ix_{table_name}_{column_name}", table_name, [column_name], if_not_exists=True)
+
+    op.create_index(
+        "ix_scraped_job_pending",
+        "scraped_job",
+        ["external_job_id"],
+        postgresql_where=sa.text("is_scraped = false AND is_failed = false"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_scraped_job_pending", table_name="scraped_job", if_exists=True)
+
+    for table_name, column_name in FOREIGN_KEY_INDEXES:
+        op.drop_index(f"ix_{table_name}_{column_name}", table_name=table_name, if_exists=True)
+
+    for table_name in OWNED_TABLES:
+        op.drop_index(f"ix_{table_name}_owner_id_created_at", table_name=table_name, if_exists=True)
@@ -0,0 +1,226 @@
+"""In-process caches, including the cache of the serialised responses of the list endpoints.
+
+Responses are stored as bytes under a (user ID, table, query parameters) key with the names of the tables they were read
+from, and are evicted after a time-to-live, when the cache is full (least recently used first), or when one of these
+tables is written to by their owner. The writes of a transaction are recorded in its session, either explicitly (see
+record_write) or by a flush hook for the ORM objects, and the caches subscribed to the invalidation bus (see
+app.invalidation) evict the matching values when it is committed, in this worker and in the others."""
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from fastapi import Response
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app import invalidation, models
+from app.config import settings
+
+# Response headers which are not stored with the cached body
+UNCACHED_HEADERS = ("content-length", "content-type")
+
+# Key of the session info in which the writes of the current transaction are recorded
+PENDING_INVALIDATIONS_KEY = "response_cache_invalidations"
+
+
+class TTLCache:
+    """Thread-safe LRU cache with a time-to-live.
+    The generation counter is incremented by every invalidation, so that a value computed from data read before a write
+    is not stored after the write has invalidated the cache."""
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        """Initialise the cache.
+        :param max_size: Maximum number of values stored (0 to disable the cache).
+        :param ttl: Number of seconds a value is kept (0 to disable the cache)."""
+
+        self.max_size = max_size
+        self.ttl = ttl
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Get a cached value.
+        :param key: Cache key.
+        :return: The value, or None if the key is not cached or has expired."""
+
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or item[0] <= time.monotonic():
+                if item is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def set(self, key, value, generation: int | None = None, ttl: float | None = None) -> None:
+        """Store a value.
+        :param key: Cache key.
+        :param value: Value to store.
+        :param generation: Value of the generation counter before the data of the value were read (None if the value
+        cannot be invalidated).
+        :param ttl: Number of seconds the value is kept, if shorter than the time-to-live of the cache."""
+
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if self.max_size <= 0 or ttl <= 0:
+            return
+
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def evict(self, predicate: Callable[[Any, Any], bool]) -> None:
+        """Evict the values matching a condition.
+        :param predicate: Function called with the key and value of each entry, returning True to evict it."""
+
+        with self._lock:
+            self.generation += 1
+            keys = [key for key, (_, value) in self._entries.items() if predicate(key, value)]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+
+    def discard(self, key) -> None:
+        """Evict a value if it is cached.
+        :param key: Cache key."""
+
+        with self._lock:
+            self.generation += 1
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self) -> None:
+        """Evict all the values."""
+
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Get the cache statistics.
+        :return: Dictionary with the size, limits and hit/miss/eviction counters of the cache."""
+
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else None,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+class ResponseCache(TTLCache):
+    """Cache of serialised responses, each stored with the names of the tables it was read from.
+    The keys start with the ID of the user the response belongs to."""
+
+    def get(self, key: tuple) -> Response | None:
+        """Get a cached response.
+        :param key: Cache key.
+        :return: A new response with the cached body and headers, or None if the key is not cached or has expired."""
+
+        item = super().get(key)
+        if item is None:
+            return None
+        _, body, status_code, media_type, headers = item
+        return Response(body, status_code=status_code, headers=headers, media_type=media_type)
+
+    def set(self, key: tuple, response: Response, tables: Iterable[str], generation: int) -> None:
+        """Store a response.
+        :param key: Cache key.
+        :param response: Rendered response.
+        :param tables: Names of the tables the response was read from.
+        :param generation: Value of the generation counter before the response data were read."""
+
+        headers = {name: value for name, value in response.headers.items() if name not in UNCACHED_HEADERS}
+        item = (frozenset(tables), response.body, response.status_code, response.media_type, headers)
+        super().set(key, item, generation)
+
+    def invalidate(self, table_name: str, owner_id: int | None) -> None:
+        """Evict the responses read from a table.
+        :param table_name: Name of the table written to.
+        :param owner_id: ID of the owner of the entries written to, or None to evict the responses of all users."""
+
+        self.evict(lambda key, item: (owner_id is None or key[0] == owner_id) and table_name in item[0])
+
+
+response_cache = ResponseCache(settings.response_cache_size, settings.response_cache_ttl)
+invalidation.subscribe(response_cache.invalidate, response_cache.clear)
+
+
+def get_dependent_models(table_model, view_models: Iterable) -> list:
+    """Get the models of the tables whose writes can change a response of a table.
+    These are the tables read to build the response and the tables referenced by a foreign key of the table (deleting a
+    referenced entry can delete or update the entries of the table). The user table referenced by the owner is
+    excluded, as a write to it does not change the entries of its owner.
+    :param table_model: SQLAlchemy model class of the table.
+    :param view_models: Models of the tables read to build the response.
+    :return: List of models, sorted by table name."""
+
+    mapped_models = {mapper.local_table.name: mapper.class_ for mapper in table_model.registry.mappers}
+    dependent_models = {model.__tablename__: model for model in view_models}
+    for foreign_key in table_model.__table__.foreign_keys:
+        if foreign_key.parent.name != "owner_id":
+            table_name = foreign_key.column.table.name
+            dependent_models.setdefault(table_name, mapped_models[table_name])
+    return [dependent_models[table_name] for table_name in sorted(dependent_models)]
+
+
+def record_write(db: Session, table_name: str, owner_id: int | None) -> None:
+    """Record a write to a table in the current transaction of a session. The other workers are notified with the
+    transaction and the cached responses are evicted when it is committed.
+    :param db: Database session.
+    :param table_name: Name of the table written to.
+    :param owner_id: ID of the owner of the entries written to, or None for all owners."""
+
+    pending = db.info.setdefault(PENDING_INVALIDATIONS_KEY, set())
+    if (table_name, owner_id) not in pending:
+        pending.add((table_name, owner_id))
+        invalidation.notify(db, table_name, owner_id)
+
+
+@event.listens_for(Session, "after_flush")
+def record_flushed_writes(session: Session, _flush_context) -> None:
+    """Record the tables and owners of the ORM objects written by a flush.
+    :param session: Session being flushed."""
+
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = inspect(instance).mapper.local_table
+        # A user is the owner of its own entry
+        owner_id = instance.id if isinstance(instance, models.User) else getattr(instance, "owner_id", None)
+        record_write(session, table.name, owner_id)
+
+
+@event.listens_for(Session, "after_commit")
+def invalidate_committed_writes(session: Session) -> None:
+    """Evict the cached values depending on the writes of a committed transaction.
+    :param session: Session being committed."""
+
+    for table_name, owner_id in session.info.pop(PENDING_INVALIDATIONS_KEY, ()):
+        invalidation.invalidate(table_name, owner_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_rolled_back_writes(session: Session) -> None:
+    """Forget the ORM objects written by a rolled back transaction.
+    :param session: Session being rolled back."""
+
+    session.info.pop(PENDING_INVALIDATIONS_KEY, None)
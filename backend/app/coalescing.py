@@ -0,0 +1,105 @@
+"""Coalescing of identical concurrent requests (single-flight).
+
+When a request arrives while an identical request of the same user is being processed (e.g. the same page open in
+several tabs), it waits for the response of the first one instead of running the same queries again. Requests are
+identical if they have the same path, query parameters and If-None-Match header."""
+
+import threading
+from collections.abc import Callable
+
+from fastapi import Response
+from starlette.requests import Request
+
+
+class InFlightCall:
+    """Computation shared by identical concurrent requests."""
+
+    def __init__(self) -> None:
+        """Initialise the call."""
+
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Thread-safe registry of the computations in progress, each shared by all the callers using the same key."""
+
+    def __init__(self) -> None:
+        """Initialise the registry."""
+
+        self.executed = 0
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: tuple, function: Callable[[], Response]) -> tuple[Response, bool]:
+        """Call a function, or wait for the result of the call in progress with the same key.
+        :param key: Key identifying the computation.
+        :param function: Function computing the result.
+        :return: The result and whether it was computed by another caller.
+        :raises: The exception raised by the function."""
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = InFlightCall()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = function()
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def stats(self) -> dict:
+        """Get the coalescing statistics.
+        :return: Dictionary with the numbers of computations in progress, executed and shared."""
+
+        with self._lock:
+            return {"in_flight": len(self._calls), "executed": self.executed, "coalesced": self.coalesced}
+
+
+single_flight = SingleFlight()
+
+
+def copy_response(response: Response) -> Response:
+    """Copy a rendered response, so that the same response object is not sent to several clients.
+    :param response: Rendered response.
+    :return: New response with the same status code, body and headers."""
+
+    headers = {
+        name: value for name, value in response.headers.items() if name not in ("content-length", "content-type")
+    }
+    return Response(response.body, status_code=response.status_code, headers=headers, media_type=response.media_type)
+
+
+def coalesce_request(request: Request, user_id: int, function: Callable[[], Response]) -> Response:
+    """Compute the response of a request once for all the identical concurrent requests of a user.
+    :param request: Request object.
+    :param user_id: ID of the authenticated user.
+    :param function: Function computing the response, which must be fully rendered (not streamed).
+    :return: The response."""
+
+    key = (
+        user_id,
+        request.url.path,
+        tuple(sorted(request.query_params.multi_items())),
+        request.headers.get("If-None-Match"),
+    )
+    response, shared = single_flight.do(key, function)
+    return copy_response(response) if shared else response
@@ -16,6 +16,22 @@ class Settings(BaseSettings):
     access_token_expire_minutes: int
     min_password_length: int
     max_file_size_mb: int
+    response_cache_size: int = 1024
+    response_cache_ttl: float = 30.0
+    user_cache_size: int = 10000
+    user_cache_ttl: float = 60.0
+    token_cache_size: int = 10000
+    bcrypt_rounds: int = 12
+    password_workers: int = 2
+    password_max_pending: int = 16
+    login_ip_capacity: int = 20
+    login_ip_rate_per_minute: float = 10.0
+    login_email_capacity: int = 5
+    login_email_rate_per_minute: float = 1.0
+    trusted_proxy_count: int = 0
+    allowlist_cache_ttl: float = 300.0
+    tombstone_retention_days: int = 90
+    sync_max_transaction_seconds: float = 300.0
 
     model_config = SettingsConfigDict(extra="ignore", env_file=Path(__file__).parent.parent / ".env")
 
@@ -4,11 +4,24 @@ Defines SQLAlchemy ORM models for email-based job scraping functionality.
 Includes models for job alert emails, extracted job IDs, and scraped job data
 with associated companies and locations from external sources."""
 
-from sqlalchemy import Column, String, Boolean, ForeignKey, Integer, DateTime, Float, TIMESTAMP, Table, UniqueConstraint
+from sqlalchemy import (
+    Column,
+    String,
+    Boolean,
+    ForeignKey,
+    Integer,
+    DateTime,
+    Float,
+    TIMESTAMP,
+    Table,
+    UniqueConstraint,
+    Index,
+    text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import expression
 
-from app.models import Base, CommonBase, Owned
+from app.models import Base, CommonBase, Owned, create_modified_index, create_owner_index, record_tombstones
 
 
 # ------------------------------------------------------ MAPPINGS ------------------------------------------------------
@@ -18,7 +31,7 @@ email_scrapedjob_mapping = Table(
     "email_scrapedjob_mapping",
     Base.metadata,
     Column("email_id", Integer, ForeignKey("job_alert_email.id", ondelete="CASCADE"), primary_key=True),
-    Column("job_id", Integer, ForeignKey("scraped_job.id", ondelete="CASCADE"), primary_key=True),
+    Column("job_id", Integer, ForeignKey("scraped_job.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 
@@ -54,7 +67,7 @@ class JobAlertEmail(Owned, Base):
     body = Column(String, nullable=True)
 
     # Foreign keys
-    service_log_id = Column(Integer, ForeignKey("eis_service_log.id", ondelete="SET NULL"), nullable=True)
+    service_log_id = Column(Integer, ForeignKey("eis_service_log.id", ondelete="SET NULL"), nullable=True, index=True)
 
     # Relationships
     jobs = relationship("ScrapedJob", secondary=email_scrapedjob_mapping, back_populates="emails")
@@ -105,7 +118,16 @@ class ScrapedJob(Owned, Base):
     emails = relationship("JobAlertEmail", secondary=email_scrapedjob_mapping, back_populates="jobs")
 
     # Constraints
-    __table_args__ = (UniqueConstraint("external_job_id", "owner_id", name="unique_job_per_owner"),)
+    __table_args__ = (
+        UniqueConstraint("external_job_id", "owner_id", name="unique_job_per_owner"),
+        # Jobs waiting to be scraped
+        Index(
+            "ix_scraped_job_pending",
+            "external_job_id",
+            # Written as the scraper filters (IS FALSE) so that the planner can match the index predicate
+            postgresql_where=text("is_scraped IS FALSE AND is_failed IS FALSE"),
+        ),
+    )
 
 
 class EisServiceLog(CommonBase, Base):
@@ -146,3 +168,12 @@ class EisServiceLog(CommonBase, Base):
     indeed_job_n = Column(Integer, default=0, nullable=False)
 
     emails = relationship("JobAlertEmail", back_populates="service_log")
+
+
+# ------------------------------------------------------- INDEXES ------------------------------------------------------
+
+
+for owned_model in (JobAlertEmail, ScrapedJob):
+    create_owner_index(owned_model)
+    create_modified_index(owned_model)
+    record_tombstones(owned_model)
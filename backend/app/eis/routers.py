@@ -8,8 +8,9 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
-from app.models import User
+from app.schemas import UserOut
 from app.eis import models, schemas
+from app.responses import ModelResponse
 from app.routers import generate_data_table_crud_router
 from app.database import get_db
 from app.oauth2 import get_current_user
@@ -23,6 +24,7 @@ email_router = generate_data_table_crud_router(
     out_schema=schemas.JobAlertEmailOut,
     endpoint="jobalertemails",
     not_found_msg="Job alert email not found",
+    sortable_fields=("created_at", "modified_at", "date_received"),
 )
 
 
@@ -34,6 +36,7 @@ scrapedjob_router = generate_data_table_crud_router(
     out_schema=schemas.ScrapedJobOut,
     endpoint="scrapedjobs",
     not_found_msg="Scraped job not found",
+    sortable_fields=("created_at", "modified_at", "deadline", "scrape_datetime"),
 )
 
 
@@ -47,7 +50,7 @@ def get_service_logs_by_date_range(
     end_date: datetime | None = Query(None, description="End date for filtering (ISO format)"),
     delta_days: int | None = Query(None, description="Number of days to go back in time"),
     limit: int | None = Query(None, description="Maximum number of logs to return"),
-    current_user: User = Depends(get_current_user),
+    current_user: UserOut = Depends(get_current_user),
     db: Session = Depends(get_db),
 ):
     """Get service logs within a specified date range. Admin access required.
@@ -80,4 +83,4 @@ def get_service_logs_by_date_range(
     if limit:
         query = query.limit(limit)
 
-    return query.all()
+    return ModelResponse(query.all(), list[schemas.EisServiceLogOut])
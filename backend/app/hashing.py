@@ -0,0 +1,132 @@
+"""Password hashing in a dedicated process pool.
+
+bcrypt is deliberately slow, so hashing and verifying passwords inline would hold the request threads (and the CPU of
+the worker) for the duration of each check. The bcrypt calls are run in a small pool of processes instead, with a
+bounded number of pending operations: when the pool is saturated (e.g. by a burst of logins), new password operations
+are rejected immediately with a 503 response rather than queued behind the others."""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException, status
+
+from app import utils
+from app.config import settings
+
+
+class PasswordPool:
+    """Bounded process pool running the bcrypt operations."""
+
+    def __init__(self, max_workers: int, max_pending: int) -> None:
+        """Initialise the pool. The processes are started on first use.
+        :param max_workers: Number of processes.
+        :param max_pending: Maximum number of operations running or waiting for a process."""
+
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def run(self, function, *args):
+        """Run a function in a process of the pool and wait for its result.
+        :param function: Module-level function to run.
+        :param args: Arguments of the function.
+        :return: The result of the function.
+        :raises: HTTPException with a 503 status code if too many operations are pending or if the process running the
+        operation died."""
+
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    detail="Too many password operations in progress, please try again later",
+                )
+            self.pending += 1
+            if self._executor is None:
+                # Spawned processes do not inherit the threads and connections of the application
+                context = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=context)
+            executor = self._executor
+
+        succeeded = False
+        try:
+            result = executor.submit(function, *args).result()
+            succeeded = True
+            return result
+        except BrokenProcessPool:
+            # A process of the pool died (e.g. killed when out of memory) and the executor now rejects every operation:
+            # it is replaced by a new one on the next call
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor.shutdown(wait=False)
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Password operation interrupted, please try again",
+            )
+        finally:
+            with self._lock:
+                self.pending -= 1
+                if succeeded:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def shutdown(self) -> None:
+        """Stop the processes of the pool."""
+
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def stats(self) -> dict:
+        """Get the pool statistics.
+        :return: Dictionary with the size of the pool, the number of pending (running or queued) operations and the
+        numbers of completed (successfully), failed and rejected operations."""
+
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "queued": max(self.pending - self.max_workers, 0),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+
+password_pool = PasswordPool(settings.password_workers, settings.password_max_pending)
+
+
+def hash_password(password: str) -> str:
+    """Hash a password with the configured bcrypt cost in the password pool.
+    :param password: password to hash
+    :return: hashed password"""
+
+    return password_pool.run(utils.hash_password, password, settings.bcrypt_rounds)
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    """Verify a password against a hash in the password pool.
+    :param password: raw password to check
+    :param hashed: hashed password from the database
+    :return: boolean indicating whether the passwords matched"""
+
+    return password_pool.run(utils.verify_password, password, hashed)
+
+
+def needs_rehash(hashed: str) -> bool:
+    """Check whether a hash was computed with a bcrypt cost different from the configured one.
+    :param hashed: hashed password from the database
+    :return: True if the password should be hashed again."""
+
+    return utils.get_hash_rounds(hashed) != settings.bcrypt_rounds
@@ -0,0 +1,140 @@
+"""Cross-worker cache invalidation bus built on Postgres LISTEN/NOTIFY.
+
+Each worker keeps its own in-process caches. A transaction writing to a table sends a notification with the table name
+and owner ID on the invalidation channel. Postgres delivers it to every listening connection when the transaction
+commits, and drops it if the transaction is rolled back. Each worker runs a listener thread which passes the
+notifications sent by the other workers to the registered caches."""
+
+import json
+import select
+import threading
+import uuid
+from collections.abc import Callable
+
+from sqlalchemy import Engine, func, select as sql_select
+from sqlalchemy.orm import Session
+
+from app.utils import get_database_logger
+
+CHANNEL = "jam_cache_invalidation"
+
+# ID of this worker, used to ignore the notifications it sent (its caches are invalidated when it commits)
+WORKER_ID = uuid.uuid4().hex
+
+# Registered (invalidate, clear) callbacks of the caches
+_subscribers: list[tuple[Callable[[str, int | None], None], Callable[[], None]]] = []
+
+
+def subscribe(invalidate: Callable[[str, int | None], None], clear: Callable[[], None]) -> None:
+    """Register a cache with the invalidation bus.
+    :param invalidate: Function called with the table name and owner ID (None for all owners) of each write.
+    :param clear: Function called when notifications may have been missed (e.g. after the listener reconnected)."""
+
+    _subscribers.append((invalidate, clear))
+
+
+def notify(db: Session, table_name: str, owner_id: int | None) -> None:
+    """Send an invalidation notification in the current transaction of a session.
+    :param db: Database session.
+    :param table_name: Name of the table written to.
+    :param owner_id: ID of the owner of the entries written to, or None for all owners."""
+
+    payload = json.dumps({"table": table_name, "owner_id": owner_id, "worker": WORKER_ID})
+    db.connection().execute(sql_select(func.pg_notify(CHANNEL, payload)))
+
+
+def dispatch(payload: str) -> None:
+    """Pass a notification sent by another worker to the registered caches.
+    :param payload: JSON payload of the notification."""
+
+    data = json.loads(payload)
+    if data.get("worker") != WORKER_ID:
+        invalidate(data["table"], data["owner_id"])
+
+
+def invalidate(table_name: str, owner_id: int | None) -> None:
+    """Pass a write to the registered caches of this worker.
+    :param table_name: Name of the table written to.
+    :param owner_id: ID of the owner of the entries written to, or None for all owners."""
+
+    for invalidate_cache, _ in _subscribers:
+        invalidate_cache(table_name, owner_id)
+
+
+def clear_all() -> None:
+    """Clear the registered caches."""
+
+    for _, clear in _subscribers:
+        clear()
+
+
+class InvalidationListener:
+    """Background thread listening to the invalidation channel on a dedicated connection.
+    The caches are cleared whenever the connection is (re)established, as the notifications sent while it was down
+    are lost."""
+
+    def __init__(self, engine: Engine, poll_interval: float = 5.0, reconnect_delay: float = 1.0) -> None:
+        """Initialise the listener.
+        :param engine: Database engine, from which the listening connection is detached.
+        :param poll_interval: Maximum number of seconds to wait for a notification before checking for a stop request.
+        :param reconnect_delay: Number of seconds to wait before reconnecting after a connection error."""
+
+        self.engine = engine
+        self.poll_interval = poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.logger = get_database_logger()
+        self.stop_event = threading.Event()
+        self.listening = threading.Event()
+        self.thread = None
+
+    def start(self) -> None:
+        """Start listening in a background thread."""
+
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="cache-invalidation-listener", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop listening and wait for the thread to finish."""
+
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self) -> None:
+        """Listen to the channel until stopped, reconnecting after connection errors."""
+
+        while not self.stop_event.is_set():
+            try:
+                self._listen()
+            except Exception as exception:
+                self.logger.error(f"Cache invalidation listener error: {exception}")
+                self.listening.clear()
+                self.stop_event.wait(self.reconnect_delay)
+
+    def _listen(self) -> None:
+        """Open a connection, listen to the channel and dispatch the notifications until stopped."""
+
+        # Detach the connection from the pool as it stays in LISTEN mode
+        pool_connection = self.engine.raw_connection()
+        connection = pool_connection.driver_connection
+        pool_connection.detach()
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+            clear_all()
+            self.listening.set()
+
+            while not self.stop_event.is_set():
+                if select.select([connection], [], [], self.poll_interval) == ([], [], []):
+                    continue
+                connection.poll()
+                while connection.notifies:
+                    dispatch(connection.notifies.pop(0).payload)
+        finally:
+            self.listening.clear()
+            connection.close()
@@ -1,12 +1,38 @@
 """Main script"""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.routers import data_tables, user, login, dashboard, export
+from app.cache import response_cache
+from app.coalescing import single_flight
+from app.database import engine
+from app.hashing import password_pool
+from app.invalidation import InvalidationListener
+from app.routers import data_tables, user, login, dashboard, export, lookup, bootstrap
+from app.routers.conditional import ETAG_HEADER
+from app.routers.pagination import NEXT_CURSOR_HEADER
+from app.tombstones import TombstonePruner
 from app.eis import routers as eis_routers
 
-app = FastAPI()
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    """Listen to the cache invalidations sent by the other workers and delete the expired tombstones while the
+    application is running, and stop the password hashing processes on shutdown."""
+
+    listener = InvalidationListener(engine)
+    listener.start()
+    pruner = TombstonePruner(engine)
+    pruner.start()
+    yield
+    pruner.stop()
+    listener.stop()
+    password_pool.shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -14,6 +40,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
 )
 
 # Data table routers
@@ -43,6 +70,12 @@ app.include_router(dashboard.router)
 # Export router
 app.include_router(export.router)
 
+# Lookup router
+app.include_router(lookup.router)
+
+# Bootstrap router
+app.include_router(bootstrap.router)
+
 
 @app.get("/")
 def read_root():
@@ -55,3 +88,18 @@ health_router = APIRouter(prefix="/health", tags=["health"])
 @app.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@app.get("/health/cache")
+def cache_statistics():
+    return response_cache.stats()
+
+
+@app.get("/health/coalescing")
+def coalescing_statistics():
+    return single_flight.stats()
+
+
+@app.get("/health/passwords")
+def password_pool_statistics():
+    return password_pool.stats()
@@ -17,6 +17,11 @@ from sqlalchemy import (
     CheckConstraint,
     Table,
     func,
+    Index,
+    case,
+    select,
+    DDL,
+    event,
 )
 from sqlalchemy.ext.declarative import declared_attr
 from sqlalchemy.ext.hybrid import hybrid_property
@@ -33,21 +38,21 @@ job_keyword_mapping = Table(
     "job_keyword_mapping",
     Base.metadata,
     Column("job_id", Integer, ForeignKey("job.id", ondelete="CASCADE"), primary_key=True),
-    Column("keyword_id", Integer, ForeignKey("keyword.id", ondelete="CASCADE"), primary_key=True),
+    Column("keyword_id", Integer, ForeignKey("keyword.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 interview_interviewer_mapping = Table(
     "interview_interviewer_mapping",
     Base.metadata,
     Column("interview_id", Integer, ForeignKey("interview.id", ondelete="CASCADE"), primary_key=True),
-    Column("person_id", Integer, ForeignKey("person.id", ondelete="CASCADE"), primary_key=True),
+    Column("person_id", Integer, ForeignKey("person.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 job_contact_mapping = Table(
     "job_contact_mapping",
     Base.metadata,
     Column("job_id", Integer, ForeignKey("job.id", ondelete="CASCADE"), primary_key=True),
-    Column("person_id", Integer, ForeignKey("person.id", ondelete="CASCADE"), primary_key=True),
+    Column("person_id", Integer, ForeignKey("person.id", ondelete="CASCADE"), primary_key=True, index=True),
 )
 
 
@@ -109,7 +114,7 @@ class User(CommonBase, Base):
     Attributes:
     -----------
     - `password` (str): Encrypted password for authentication.
-    - `email` (str): User's email address (must be unique).
+    - `email` (str): User's email address (must be unique, regardless of case).
     - `theme` (str): The theme of the application.
     - `is_admin` (bool): Indicates whether the user is an administrator.
     - `last_login` (datetime): The timestamp of the last login.
@@ -128,6 +133,7 @@ class User(CommonBase, Base):
 
     __table_args__ = (
         CheckConstraint(f"length(password) >= {settings.min_password_length}", name="minimum_password_length"),
+        Index("ix_user_lower_email", func.lower(email), unique=True),
     )
 
 
@@ -233,6 +239,14 @@ class Location(Owned, Base):
 
         return ", ".join(parts)
 
+    @name.expression
+    def name(cls):
+        """SQL expression of the location name, skipping the empty parts"""
+
+        return func.concat_ws(
+            ", ", func.nullif(cls.city, ""), func.nullif(cls.country, ""), func.nullif(cls.postcode, "")
+        )
+
     __table_args__ = (
         CheckConstraint(
             "postcode IS NOT NULL OR city IS NOT NULL OR country IS NOT NULL",
@@ -302,6 +316,12 @@ class Person(Owned, Base):
 
         return f"{self.first_name} {self.last_name}"
 
+    @name.expression
+    def name(cls):
+        """SQL expression of the person name"""
+
+        return cls.first_name + " " + cls.last_name
+
     @hybrid_property
     def name_company(self) -> str:
         """Computed property that combines the first name, last name, and the company name"""
@@ -311,6 +331,16 @@ class Person(Owned, Base):
         else:
             return self.name
 
+    @name_company.expression
+    def name_company(cls):
+        """SQL expression of the person name with the company name, read with a correlated subquery"""
+
+        company_name = select(Company.name).where(Company.id == cls.company_id).scalar_subquery()
+        return case(
+            (company_name.isnot(None), cls.first_name + " " + cls.last_name + " - " + company_name),
+            else_=cls.first_name + " " + cls.last_name,
+        )
+
 
 class Job(Owned, Base):
     """Represents job postings within the application.
@@ -394,6 +424,17 @@ class Job(Owned, Base):
         else:
             return "Unknown Job"
 
+    @name.expression
+    def name(cls):
+        """SQL expression of the job name, reading the company name with a correlated subquery"""
+
+        company_name = select(Company.name).where(Company.id == cls.company_id).scalar_subquery()
+        return case(
+            (func.coalesce(cls.title, "") == "", "Unknown Job"),
+            (func.coalesce(company_name, "") == "", cls.title),
+            else_=cls.title + " - " + company_name,
+        )
+
     __table_args__ = (
         CheckConstraint("personal_rating >= 1 AND personal_rating <= 5", name=f"valid_rating_range"),
         CheckConstraint("salary_min <= salary_max", name=f"valid_salary_range"),
@@ -460,7 +501,87 @@ class JobApplicationUpdate(Owned, Base):
     type = Column(String, nullable=False)
 
     # Foreign keys
-    job_id = Column(Integer, ForeignKey("job.id", ondelete="CASCADE"), nullable=False)
+    job_id = Column(Integer, ForeignKey("job.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Relationships
     job = relationship("Job", back_populates="updates")
+
+
+# ----------------------------------------------------- TOMBSTONES -----------------------------------------------------
+
+
+class Tombstone(CommonBase, Base):
+    """Represents a deleted entry, used to propagate deletions to the clients synchronising a table.
+    Tombstones are recorded by a database trigger so that entries deleted by cascade are also recorded.
+
+    Attributes:
+    -----------
+    - `table_name` (str): Name of the table of the deleted entry.
+    - `entry_id` (int): ID of the deleted entry.
+    - `owner_id` (int, optional): ID of the owner of the deleted entry. Not a foreign key so that the entries deleted
+    with their owner can be recorded.
+    - `created_at` (datetime): Deletion date. Tombstones are deleted after `tombstone_retention_days` days."""
+
+    table_name = Column(String, nullable=False)
+    entry_id = Column(Integer, nullable=False)
+    owner_id = Column(Integer, nullable=True)
+
+    __table_args__ = (
+        Index("ix_tombstone_table_name_owner_id_created_at", "table_name", "owner_id", "created_at"),
+        # Expired tombstones
+        Index("ix_tombstone_created_at", "created_at"),
+    )
+
+
+# Statement-level trigger function recording one tombstone per deleted row
+TOMBSTONE_FUNCTION = DDL(
+    """
+    CREATE OR REPLACE FUNCTION record_tombstones() RETURNS trigger AS $$
+    BEGIN
+        INSERT INTO tombstone (table_name, entry_id, owner_id)
+        SELECT TG_TABLE_NAME, deleted.id, (to_jsonb(deleted) ->> 'owner_id')::integer FROM deleted;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """
+)
+event.listen(Base.metadata, "before_create", TOMBSTONE_FUNCTION)
+
+
+def record_tombstones(model) -> None:
+    """Create the trigger recording the deleted entries of a table along with the table.
+    :param model: Model class."""
+
+    table_name = model.__tablename__
+    trigger = DDL(
+        f'CREATE TRIGGER "{table_name}_tombstone" AFTER DELETE ON "{table_name}" '
+        f"REFERENCING OLD TABLE AS deleted FOR EACH STATEMENT EXECUTE FUNCTION record_tombstones()"
+    )
+    event.listen(model.__table__, "after_create", trigger)
+
+
+# ------------------------------------------------------- INDEXES ------------------------------------------------------
+
+
+def create_owner_index(model) -> Index:
+    """Create the composite index used by the owner-scoped list queries of a table.
+    The entries of a user are stored in creation order so that keyset pages are read with an index range scan.
+    :param model: Model class inheriting from Owned."""
+
+    return Index(f"ix_{model.__tablename__}_owner_id_created_at", model.owner_id, model.created_at, model.id)
+
+
+def create_modified_index(model) -> Index:
+    """Create the index used to compute the conditional request validators (ETags) of a table.
+    The number of entries and the latest modification date of a user are both read from the index only.
+    :param model: Model class inheriting from Owned."""
+
+    return Index(f"ix_{model.__tablename__}_owner_id_modified_at", model.owner_id, model.modified_at)
+
+
+for owned_model in (Keyword, Aggregator, Company, Location, File, Person, Job, Interview, JobApplicationUpdate):
+    create_owner_index(owned_model)
+    create_modified_index(owned_model)
+    record_tombstones(owned_model)
+
+record_tombstones(Setting)
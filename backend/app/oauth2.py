@@ -1,6 +1,8 @@
 """This module handles authentication and authorisation functionality for the application, including the creation,
 verification, and usage of JWT access tokens."""
 
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
 
 from fastapi import Depends, HTTPException, status
@@ -8,7 +10,8 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from sqlalchemy.orm import Session
 
-from app import models, database, schemas
+from app import invalidation, models, database, schemas
+from app.cache import TTLCache
 from app.config import settings
 
 
@@ -18,6 +21,28 @@ ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
+# Verified tokens by SHA-256 digest, each kept until the token expires
+token_cache = TTLCache(settings.token_cache_size, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+# Authenticated users by ID, evicted when their entry is written to
+user_cache = TTLCache(settings.user_cache_size, settings.user_cache_ttl)
+
+
+def invalidate_user(table_name: str, owner_id: int | None) -> None:
+    """Evict a user from the cache after a write to the user table.
+    :param table_name: Name of the table written to.
+    :param owner_id: ID of the user written to, or None for all users."""
+
+    if table_name != models.User.__tablename__:
+        return
+    if owner_id is None:
+        user_cache.clear()
+    else:
+        user_cache.discard(owner_id)
+
+
+invalidation.subscribe(invalidate_user, user_cache.clear)
+
 
 def create_access_token(data: dict) -> str:
     """Create a JWT access token.
@@ -36,10 +61,16 @@ def verify_access_token(
     credentials_exception: Exception,
 ) -> schemas.TokenData:
     """Verify the JWT access token.
+    Verified tokens are cached until they expire, so that the signature of a token is only checked once per worker.
     :param token: JWT access token to be verified.
     :param credentials_exception: The exception to be raised if the token is invalid or the user ID is not found.
     :returns: object containing the user ID extracted from the token."""
 
+    digest = hashlib.sha256(token.encode("utf-8")).digest()
+    token_data = token_cache.get(digest)
+    if token_data is not None:
+        return token_data
+
     # noinspection PyUnresolvedReferences
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
@@ -53,14 +84,18 @@ def verify_access_token(
     except jwt.JWTError:
         raise credentials_exception
 
+    if "exp" in payload:
+        token_cache.set(digest, token_data, ttl=payload["exp"] - time.time())
     return token_data
 
 
 def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(database.get_db),
-) -> models.User | None:
+) -> schemas.UserOut | None:
     """Get the current user from the token and check if the token has expired.
+    The user is read from the user cache, so that most requests do not query the user table. The session only connects
+    to the database on a cache miss.
     :param token: The JWT access token.
     :param db: The database session.
     :returns: The current user or None"""
@@ -70,5 +105,16 @@ def get_current_user(
         detail="Could not validate credentials",
     )
     token = verify_access_token(token, credentials_exception)
-    user = db.query(models.User).filter(token.id == models.User.id).first()
+    if not token.id.isdigit():
+        raise credentials_exception
+    user_id = int(token.id)
+
+    user = user_cache.get(user_id)
+    if user is None:
+        generation = user_cache.generation
+        user_db = db.query(models.User).filter(models.User.id == user_id).first()
+        if user_db is None:
+            return None
+        user = schemas.UserOut.model_validate(user_db, from_attributes=True)
+        user_cache.set(user_id, user, generation)
     return user
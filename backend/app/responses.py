@@ -0,0 +1,120 @@
+"""Response encoding helpers"""
+
+from collections.abc import Callable, Iterable, Mapping
+from functools import cache
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from starlette.requests import Request
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+@cache
+def get_type_adapter(response_type) -> TypeAdapter:
+    """Get the TypeAdapter of a response type (e.g. JobOut or list[JobOut]). Building a TypeAdapter compiles its
+    validator and serialiser, so each adapter is only built once.
+    :param response_type: Response type.
+    :return: The cached TypeAdapter."""
+
+    return TypeAdapter(response_type)
+
+
+def dump_json(response_type, content) -> bytes:
+    """Validate the content with a response type and serialise it to JSON bytes.
+    :param response_type: Response type.
+    :param content: Content, which can contain ORM objects (read from their attributes) or validated models.
+    :return: JSON bytes."""
+
+    adapter = get_type_adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(content, from_attributes=True))
+
+
+class ModelResponse(Response):
+    """JSON response serialised with the cached TypeAdapter of its type.
+    Returning this response from an endpoint bypasses the response_model validation and jsonable_encoder: the content is
+    validated and serialised to bytes in a single pass by pydantic-core."""
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        content,
+        response_type,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ) -> None:
+        """Create the response.
+        :param content: Response content.
+        :param response_type: Type used to validate and serialise the content.
+        :param status_code: Response status code.
+        :param headers: Optional response headers."""
+
+        self.response_type = response_type
+        super().__init__(content, status_code, headers)
+
+    def render(self, content) -> bytes:
+        """Serialise the response content.
+        :param content: Response content."""
+
+        return dump_json(self.response_type, content)
+
+
+def to_columnar(rows: list[dict], fields: list[str]) -> dict[str, list]:
+    """Convert a list of rows into a columnar structure, mapping each field name to the list of its values.
+    Field names are only sent once, instead of once per row.
+    :param rows: List of rows.
+    :param fields: Names of the fields.
+    :return: Dictionary mapping each field name to its values."""
+
+    return {field: [row[field] for row in rows] for field in fields}
+
+
+def json_response(content, status_code: int = 200, headers: Mapping[str, str] | None = None) -> Response:
+    """Create a JSON response, serialising the content directly to bytes.
+    :param content: JSON-compatible content, which can include dates.
+    :param status_code: Response status code.
+    :param headers: Optional response headers."""
+
+    return Response(content=to_json(content), status_code=status_code, headers=headers, media_type="application/json")
+
+
+def columnar_response(fields: list[str], rows: list[tuple], headers: Mapping[str, str] | None = None) -> Response:
+    """Create a columnar JSON response directly from SQL result tuples.
+    :param fields: Names of the fields, in the order of the tuple values.
+    :param rows: Result tuples.
+    :param headers: Optional response headers.
+    :return: JSON response mapping each field name to the list of its values."""
+
+    columns = list(zip(*rows)) if rows else [() for _ in fields]
+    return json_response({field: list(values) for field, values in zip(fields, columns)}, headers=headers)
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """Check whether a request asks for a newline-delimited JSON response.
+    :param request: Request object."""
+
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(
+    lines: Iterable[bytes],
+    on_close: Callable[[], None] | None = None,
+    headers: Mapping[str, str] | None = None,
+) -> StreamingResponse:
+    """Create a newline-delimited JSON response sending each line as soon as it is produced.
+    :param lines: Iterable of JSON-encoded lines, consumed while the response is sent.
+    :param on_close: Function called once the response is sent or the client disconnects (e.g. to close the session).
+    :param headers: Optional response headers."""
+
+    def generate():
+        try:
+            for line in lines:
+                yield line + b"\n"
+        finally:
+            if on_close is not None:
+                on_close()
+
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE, headers=headers)
@@ -3,12 +3,53 @@
 Provides a factory function to generate FastAPI routers with standard CRUD endpoints,
 including user ownership validation, query filtering, and many-to-many relationship handling."""
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from datetime import datetime, timedelta, timezone
+from typing import Literal
+
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Response
+from sqlalchemy import delete as sql_delete, func, insert, select, text, update as sql_update
+from pydantic_core import to_json
+from sqlalchemy.orm import Query as SQLQuery, Session, selectinload
 from starlette import status
 from starlette.requests import Request
 
-from app import database, models, oauth2
+from app import database, models, oauth2, schemas
+from app.cache import get_dependent_models, record_write, response_cache
+from app.coalescing import coalesce_request
+from app.config import settings
+from app.responses import ModelResponse, accepts_ndjson, columnar_response, dump_json, ndjson_response
+from app.routers.conditional import ETAG_HEADER, compute_etag, is_not_modified, not_modified_response
+from app.routers.filters import build_filter_parsers, compile_filters
+from app.routers.loading import build_core_columns, build_loader_options, get_loaded_models
+from app.routers.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    keyset_order,
+    parse_order_by,
+)
+
+# Number of rows fetched at a time from the server-side cursor of a streamed response
+STREAM_BATCH_SIZE = 500
+
+# Query parameters of the list endpoint which are not column filters
+RESERVED_QUERY_PARAMS = ("limit", "page_size", "cursor", "order_by", "view", "format")
+
+# Start date of the oldest transaction in progress in the database (the current transaction included), or the date
+# `sync_max_transaction_seconds` seconds ago if it is older. The rows written by a transaction are dated from its start
+# (now()) but only become visible when it is committed. Only the client sessions running a transaction are considered
+# (not the idle sessions, autovacuum or other background processes), and a leaked or long-running transaction does not
+# hold the synchronisations back for longer than the limit, at the cost of skipping its writes if it commits later
+OLDEST_TRANSACTION_START = text(
+    """
+    SELECT greatest(least(now(), min(xact_start)), now() - make_interval(secs => :max_age))
+    FROM pg_stat_activity
+    WHERE datname = current_database() AND backend_type = 'client backend' AND state <> 'idle'
+    """
+)
 
 
 def generate_data_table_crud_router(
@@ -22,6 +63,12 @@ def generate_data_table_crud_router(
     many_to_many_fields: dict = None,
     router: APIRouter | None = None,
     admin_only: bool = False,
+    sortable_fields: tuple[str, ...] = ("created_at", "modified_at"),
+    filterable_fields: tuple[str, ...] | None = None,
+    loader_options: list | None = None,
+    min_out_schema=None,
+    core_reads: bool = True,
+    cached: bool = True,
 ) -> APIRouter:
     """Generate a FastAPI router with standard CRUD endpoints for a given table.
     :param table_model: SQLAlchemy model class representing the database table.
@@ -40,45 +87,153 @@ def generate_data_table_crud_router(
                                }
     :param router: Optional router to which the endpoints will be added.
     :param admin_only: If True, restrict access to admin users only.
+    :param sortable_fields: Whitelist of the columns the list endpoint can be sorted and paginated by.
+    :param filterable_fields: Whitelist of the columns the list endpoint can be filtered by (default: all columns).
+    :param loader_options: SQLAlchemy loader options applied when reading entries (default: derived from out_schema).
+    :param min_out_schema: Optional bare Pydantic schema returned by the get endpoints when called with view=min.
+    :param core_reads: If True, the list endpoint builds the entries of the flat views (without relationships) directly
+                       from the selected columns instead of loading ORM objects.
+    :param cached: If True, the responses of the list endpoint are stored in the response cache (see app.cache) and
+                   invalidated by the write endpoints.
     :return: Configured APIRouter instance with CRUD endpoints."""
 
     if router is None:
         router = APIRouter(prefix=f"/{endpoint}", tags=[endpoint])
 
+    filter_parsers = build_filter_parsers(table_model, filterable_fields)
+    table_columns = {column.key: getattr(table_model, column.key) for column in table_model.__table__.columns}
+    if loader_options is None:
+        loader_options = build_loader_options(table_model, out_schema)
+
+    # Response views of the get endpoints: (output schema, loader options, models of the tables read)
+    views = {"full": (out_schema, loader_options, get_loaded_models(table_model, out_schema))}
+    if min_out_schema is not None:
+        views["min"] = (
+            min_out_schema,
+            build_loader_options(table_model, min_out_schema),
+            get_loaded_models(table_model, min_out_schema),
+        )
+        get_response_model = out_schema | min_out_schema
+    else:
+        get_response_model = out_schema
+
+    # Columns selected by the list endpoint for the flat views, None for the views requiring ORM objects
+    core_columns = {
+        view: build_core_columns(table_model, schema, ("id", *sortable_fields)) if core_reads else None
+        for view, (schema, _, _) in views.items()
+    }
+
+    # Tables whose writes can change the responses of each view (the columnar format only reads the table): their state
+    # is part of the ETag and their writes invalidate the cached list responses
+    dependent_models = {
+        view: get_dependent_models(table_model, view_models) for view, (_, _, view_models) in views.items()
+    }
+    dependent_models["columnar"] = get_dependent_models(table_model, [table_model])
+    cache_tables = {
+        view: frozenset(model.__tablename__ for model in view_models) for view, view_models in dependent_models.items()
+    }
+
+    # Loader options of the streamed responses, which read the rows in batches and cannot use joined eager loading
+    stream_loader_options = {
+        view: build_loader_options(table_model, schema, many_to_one_loader=selectinload)
+        for view, (schema, _, _) in views.items()
+    }
+
+    def load_entries(db: Session, options: list | None = None):
+        """Query the table with the relationships serialised by the output schema eagerly loaded.
+        :param db: Database session.
+        :param options: Loader options (default: those of the full output schema).
+        :return: SQLAlchemy query."""
+
+        if options is None:
+            options = loader_options
+        return db.query(table_model).options(*options).execution_options(populate_existing=True)
+
+    def get_view(view: str) -> tuple:
+        """Get the output schema, loader options and read tables of a response view.
+        :param view: Name of the view.
+        :return: The output schema, the loader options and the models of the tables read.
+        :raises: HTTPException with a 400 status code if the view is not available for this table."""
+
+        if view not in views:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown view '{view}'. Available views: {', '.join(views)}",
+            )
+        return views[view]
+
+    def get_etag(db: Session, request: Request, current_user: schemas.UserOut, table_models: list, *parts) -> str:
+        """Compute the ETag of a get request.
+        :param db: Database session.
+        :param request: Request object, whose query parameters are part of the ETag.
+        :param current_user: Authenticated user.
+        :param table_models: Models of the tables whose writes can change the response.
+        :param parts: Other values the response depends on.
+        :return: The ETag value."""
+
+        owner_id = None if admin_only else current_user.id
+        return compute_etag(db, table_models, owner_id, current_user.id, str(request.query_params), *parts)
+
+    def invalidate_cache(db: Session, current_user: schemas.UserOut):
+        """Record a write to the table in the current transaction, so that the cached responses depending on it are
+        evicted in all the workers when it is committed.
+        :param db: Database session.
+        :param current_user: Authenticated user writing to the table."""
+
+        record_write(db, table_model.__tablename__, None if admin_only else current_user.id)
+
+    def split_many_to_many(item_data: dict) -> tuple[dict, dict]:
+        """Separate the many-to-many fields from the main fields of an entry.
+        :param item_data: Data of the entry
+        :return: The main data and the many-to-many data"""
+
+        main_data = item_data.copy()
+        m2m_data = {}
+
+        if many_to_many_fields:
+            for field_name in many_to_many_fields.keys():
+                if field_name in main_data:
+                    m2m_data[field_name] = main_data.pop(field_name)
+
+        return main_data, m2m_data
+
     def handle_many_to_many_create(
         db: Session,
-        entry_id: int,
-        item_data: dict,
+        entries: list[tuple[int, dict]],
     ):
         """Handle the creation of many-to-many relationships.
+        All the relationships of an association table are inserted with a single executemany.
         :param db: Database session
-        :param entry_id: ID of the entry to which the relationships are being added
-        :param item_data: Data containing the relationships to be added"""
+        :param entries: List of (entry ID, data containing the relationships to be added) pairs"""
 
         if not many_to_many_fields:
             return
 
         for field_name, m2m_config in many_to_many_fields.items():
+            association_table = m2m_config["table"]
+            local_key = m2m_config["local_key"]
+            remote_key = m2m_config["remote_key"]
 
-            if field_name in item_data and item_data[field_name] is not None:
-                values = item_data[field_name]
+            rows = []
+            for entry_id, item_data in entries:
+                values = item_data.get(field_name)
                 if isinstance(values, list):
-                    association_table = m2m_config["table"]
-                    local_key = m2m_config["local_key"]
-                    remote_key = m2m_config["remote_key"]
+                    rows.extend({local_key: entry_id, remote_key: value_id} for value_id in values)
 
-                    # Insert the relationships
-                    for value_id in values:
-                        db.execute(association_table.insert().values(**{local_key: entry_id, remote_key: value_id}))
+            # Insert the relationships
+            if rows:
+                db.execute(association_table.insert(), rows)
 
     def handle_many_to_many_update(
         db: Session,
-        entry_id: int,
+        entry_ids: list[int],
         item_data: dict,
     ):
         """Handle updating of many-to-many relationships.
+        The existing relationships are compared with the new ones so that only the removed relationships are deleted
+        and only the added ones are inserted.
         :param db: Database session
-        :param entry_id: ID of the entry to which the relationships are being added
+        :param entry_ids: IDs of the entries to which the relationships are being added
         :param item_data: Data containing the relationships to be added"""
 
         if not many_to_many_fields:
@@ -89,111 +244,384 @@ def generate_data_table_crud_router(
                 association_table = m2m_config["table"]
                 local_key = m2m_config["local_key"]
                 remote_key = m2m_config["remote_key"]
+                local_column = getattr(association_table.c, local_key)
+                remote_column = getattr(association_table.c, remote_key)
 
-                # Delete existing relationships
-                db.execute(association_table.delete().where(getattr(association_table.c, local_key) == entry_id))
-
-                # Add new relationships if provided
                 values = item_data[field_name]
-                if values is not None and isinstance(values, list):
-                    for value_id in values:
-                        db.execute(association_table.insert().values(**{local_key: entry_id, remote_key: value_id}))
+                values = list(dict.fromkeys(values)) if isinstance(values, list) else []
+
+                # Get the existing relationships
+                existing = db.execute(select(local_column, remote_column).where(local_column.in_(entry_ids))).all()
+                existing_pairs = set(existing)
+
+                # Delete the relationships which are no longer required
+                removed_ids = {value_id for _, value_id in existing} - set(values)
+                if removed_ids:
+                    db.execute(
+                        association_table.delete().where(local_column.in_(entry_ids), remote_column.in_(removed_ids))
+                    )
+
+                # Add the new relationships
+                rows = [
+                    {local_key: entry_id, remote_key: value_id}
+                    for entry_id in entry_ids
+                    for value_id in values
+                    if (entry_id, value_id) not in existing_pairs
+                ]
+                if rows:
+                    db.execute(association_table.insert(), rows)
+
+    def get_access_filters(current_user: schemas.UserOut) -> list:
+        """Get the SQL conditions restricting a statement to the entries the user is allowed to modify.
+        :param current_user: Authenticated user.
+        :return: List of SQL conditions.
+        :raises: HTTPException with a 403 status code if the table is restricted to admin users."""
+
+        if admin_only:
+            if not current_user.is_admin:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN, detail="Not authorised to perform requested action"
+                )
+            return []
+
+        # noinspection PyTypeChecker
+        return [table_model.owner_id == current_user.id]
+
+    def raise_inaccessible_entries(
+        db: Session,
+        entry_ids: list[int],
+        found_ids: list[int],
+    ):
+        """Roll back the current transaction and raise the error explaining why some entries could not be accessed.
+        :param db: Database session
+        :param entry_ids: Requested entry IDs
+        :param found_ids: IDs of the entries which could be accessed
+        :raises: HTTPException with a 404 status code if an entry does not exist, with a 403 status code otherwise."""
+
+        db.rollback()
+        missing_ids = set(entry_ids) - set(found_ids)
+        existing_ids = db.scalars(select(table_model.id).where(table_model.id.in_(missing_ids))).all()
+        if len(existing_ids) < len(missing_ids):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found_msg)
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorised to perform requested action")
+
+    def update_entries(
+        db: Session,
+        entry_ids: list[int],
+        item_dict: dict,
+        access_filters: list,
+    ):
+        """Update entries with a single ownership-filtered UPDATE ... RETURNING statement and update their
+        many-to-many relationships. The transaction is not committed.
+        :param db: Database session
+        :param entry_ids: IDs of the entries to update
+        :param item_dict: The updated data
+        :param access_filters: SQL conditions restricting the update to the entries the user can modify
+        :raises: HTTPException with a 404 or 403 status code if an entry cannot be updated."""
+
+        main_data, m2m_data = split_many_to_many(item_dict)
+
+        # Update the main fields (or only the modification date if the relationships are the only change)
+        statement = (
+            sql_update(table_model)
+            .where(table_model.id.in_(entry_ids), *access_filters)
+            .values(**(main_data or {"modified_at": func.now()}))
+            .returning(table_model.id)
+            .execution_options(synchronize_session=False)
+        )
+        updated_ids = db.scalars(statement).all()
+
+        if len(updated_ids) < len(entry_ids):
+            raise_inaccessible_entries(db, entry_ids, updated_ids)
+
+        # Handle many-to-many relationships
+        if m2m_data:
+            handle_many_to_many_update(db, entry_ids, m2m_data)
+
+    def delete_entries(
+        db: Session,
+        entry_ids: list[int],
+        access_filters: list,
+    ):
+        """Delete entries and their many-to-many relationships. The relationships are removed with one statement per
+        association table and the entries with a single ownership-filtered DELETE statement. The transaction is not
+        committed.
+        :param db: Database session
+        :param entry_ids: IDs of the entries to delete
+        :param access_filters: SQL conditions restricting the deletion to the entries the user can modify
+        :raises: HTTPException with a 404 or 403 status code if an entry cannot be deleted."""
+
+        # Delete many-to-many relationships first if they exist
+        if many_to_many_fields:
+            accessible_ids = select(table_model.id).where(table_model.id.in_(entry_ids), *access_filters)
+            for m2m_config in many_to_many_fields.values():
+                association_table = m2m_config["table"]
+                local_key = getattr(association_table.c, m2m_config["local_key"])
+                db.execute(association_table.delete().where(local_key.in_(accessible_ids)))
+
+        statement = (
+            sql_delete(table_model)
+            .where(table_model.id.in_(entry_ids), *access_filters)
+            .returning(table_model.id)
+            .execution_options(synchronize_session=False)
+        )
+        deleted_ids = db.scalars(statement).all()
+
+        if len(deleted_ids) < len(entry_ids):
+            raise_inaccessible_entries(db, entry_ids, deleted_ids)
 
     # noinspection PyTypeHints
-    @router.get("/", response_model=list[out_schema])
+    @router.get("/", response_model=list[get_response_model])
     def get_all(
         request: Request,
+        response: Response,
         db: Session = Depends(database.get_db),
-        current_user: models.User = Depends(oauth2.get_current_user),
+        current_user: schemas.UserOut = Depends(oauth2.get_current_user),
         limit: int | None = None,
+        page_size: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        cursor: str | None = None,
+        order_by: str | None = None,
+        view: Literal["full", "min"] = "full",
+        encoding: Literal["json", "columnar"] = Query("json", alias="format"),
     ):
         """Retrieve all entries for the current user.
+        Entries can be filtered with `field=value` or `field__operator=value` query parameters (see app.routers.filters).
+        If page_size or cursor is provided, the entries are returned one page at a time (keyset pagination) and the
+        token of the next page is returned in the X-Next-Cursor response header.
+        If the request accepts application/x-ndjson, the entries are streamed one per line as they are read from a
+        server-side cursor, so that the memory usage does not depend on the number of entries.
+        Other responses are served from the response cache until the table or a table they depend on is written to, and
+        are computed once for all the identical requests of the user received while it is being computed.
         :param request: FastAPI request object to access query parameters
+        :param response: FastAPI response object used to return the next page cursor.
         :param db: Database session.
         :param current_user: Authenticated user.
         :param limit: Maximum number of entries to return.
-        :return: List of entries."""
-
-        # Start with base query
-        if not admin_only:
+        :param page_size: Number of entries per page.
+        :param cursor: Cursor token returned with the previous page.
+        :param order_by: Comma-separated sort fields, each prefixed with '-' for a descending order (e.g. '-deadline,id').
+        :param view: Response view: 'full' for the output schema with its nested entries, 'min' for the bare schema.
+        :param encoding: Response encoding: 'json' for a list of objects, 'columnar' for a mapping of each table column to
+        the list of its values, read directly from the SQL rows (relationships are not included).
+        :return: List of entries, or an empty 304 response if the entries match the If-None-Match header."""
+
+        schema, options, _ = get_view(view)
+        access_filters = get_access_filters(current_user)
+        data_view = "columnar" if encoding == "columnar" else view
+
+        # Serve the response from the cache if the tables it depends on have not been written to since it was stored
+        use_cache = cached and not accepts_ndjson(request)
+        cache_key = (current_user.id, table_model.__tablename__, tuple(sorted(request.query_params.multi_items())))
+        cache_generation = response_cache.generation
+        if use_cache:
+            cached_response = response_cache.get(cache_key)
+            if cached_response is not None:
+                if is_not_modified(request, cached_response.headers[ETAG_HEADER]):
+                    return not_modified_response(cached_response.headers[ETAG_HEADER])
+                return cached_response
+
+        def build_response() -> Response:
+            """Build the response of the request from the database.
+            :return: The response, or an empty 304 response if the entries match the If-None-Match header."""
+
+            # Skip loading the entries if the client copy is up to date
+            etag = get_etag(db, request, current_user, dependent_models[data_view])
+            if is_not_modified(request, etag):
+                return not_modified_response(etag)
+            response.headers[ETAG_HEADER] = etag
+
+            def respond(entries: SQLQuery | list):
+                """Encode the entries in the requested format.
+                :param entries: Query or list of table entries, or of column tuples in columnar format."""
+
+                if accepts_ndjson(request):
+                    if isinstance(entries, SQLQuery):
+                        entries = entries.yield_per(STREAM_BATCH_SIZE)
+                    if encoding == "columnar":
+                        lines = (to_json(row._asdict()) for row in entries)
+                    else:
+                        lines = (dump_json(schema, entry) for entry in entries)
+                    # The dependency may close the session before the body is sent: close it again once the rows are sent
+                    return ndjson_response(lines, on_close=db.close, headers=response.headers)
+
+                if isinstance(entries, SQLQuery):
+                    entries = entries.all()
+                if encoding == "columnar":
+                    result = columnar_response(list(table_columns), entries, headers=response.headers)
+                elif core_columns[view] is not None:
+                    result = ModelResponse([row._asdict() for row in entries], list[schema], headers=response.headers)
+                else:
+                    result = ModelResponse(entries, list[schema], headers=response.headers)
+
+                if use_cache:
+                    response_cache.set(cache_key, result, cache_tables[data_view], cache_generation)
+                return result
+
+            # Start with base query
             # noinspection PyTypeChecker
-            query = db.query(table_model).filter(table_model.owner_id == current_user.id)
-        elif current_user.is_admin:
-            query = db.query(table_model)
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Not authorised to perform requested action"
-            )
-
-        # Get all query parameters except 'limit'
-        filter_params = dict(request.query_params)
-        filter_params.pop("limit", None)  # Remove limit from filters
+            if encoding == "columnar":
+                query = db.query(*table_columns.values()).filter(*access_filters)
+            elif accepts_ndjson(request):
+                query = load_entries(db, stream_loader_options[view]).filter(*access_filters)
+            elif core_columns[view] is not None:
+                query = db.query(*core_columns[view]).filter(*access_filters)
+            else:
+                query = load_entries(db, options).filter(*access_filters)
+
+            # Get all query parameters except the pagination ones
+            filter_params = dict(request.query_params)
+            for param_name in RESERVED_QUERY_PARAMS:
+                filter_params.pop(param_name, None)
+
+            # Apply filters for each parameter that matches a filterable column
+            query = query.filter(*compile_filters(filter_params, filter_parsers))
+
+            if order_by is None and page_size is None and cursor is None:
+                return respond(query.limit(limit))
+
+            # Sort by the requested columns with the ID as tie-breaker
+            sort = parse_order_by(order_by or "created_at", sortable_fields)
+            if page_size is None and cursor is None:
+                order_clauses = []
+                for sort_field, descending in sort:
+                    sort_column = getattr(table_model, sort_field)
+                    order_clauses.append(
+                        sort_column.desc().nulls_last() if descending else sort_column.asc().nulls_last()
+                    )
+                if "id" not in [sort_field for sort_field, _ in sort]:
+                    order_clauses.append(table_model.id.desc() if sort[-1][1] else table_model.id.asc())
+                return respond(query.order_by(*order_clauses).limit(limit))
+
+            # Keyset pagination: resume after the last entry of the previous page
+            if len(sort) > 1:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Paginated requests can only be sorted by one field"
+                )
+            sort_field, descending = sort[0]
+            sort_column = getattr(table_model, sort_field)
+            query = query.order_by(*keyset_order(sort_column, table_model.id, descending))
+
+            if cursor:
+                value, last_id = decode_cursor(cursor, sort_field, sort_column)
+                query = query.filter(keyset_filter(sort_column, table_model.id, value, last_id, descending))
+
+            size = page_size or DEFAULT_PAGE_SIZE
+            entries = query.limit(size + 1).all()
+            if len(entries) > size:
+                entries = entries[:size]
+                last = entries[-1]
+                response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort_field, getattr(last, sort_field), last.id)
+
+            return respond(entries)
+
+        # Identical concurrent requests share the same response (streamed responses cannot be shared)
+        if accepts_ndjson(request):
+            return build_response()
+        return coalesce_request(request, current_user.id, build_response)
 
-        # Apply filters for each parameter that matches a table column
-        for param_name, param_value in filter_params.items():
-            if hasattr(table_model, param_name):
-                column = getattr(table_model, param_name)
+    # noinspection PyTypeHints
+    @router.get("/changes", response_model=schemas.ChangesOut[get_response_model])
+    def get_changes(
+        since: datetime,
+        db: Session = Depends(database.get_db),
+        current_user: schemas.UserOut = Depends(oauth2.get_current_user),
+        view: Literal["full", "min"] = "full",
+    ):
+        """Get the entries modified and the IDs of the entries deleted since a given date.
+        Clients keep a table in sync by passing the `until` value of the previous response as the next `since` value.
+        `until` is the start date of the oldest transaction in progress (of at most `sync_max_transaction_seconds`
+        seconds ago), so that the changes of the transactions committed after the response are returned by the next
+        synchronisation. Entries changed around this date can be
+        returned twice and must be updated by ID.
+        Entries deleted by cascade are also returned (tombstones are recorded by a database trigger), but entries
+        modified by a cascade (e.g. a foreign key set to NULL) are not. Tombstones are kept for
+        `tombstone_retention_days` days: older synchronisations must reload the entries.
+        :param since: Date of the previous synchronisation (inclusive).
+        :param db: Database session.
+        :param current_user: Authenticated user.
+        :param view: Response view: 'full' for the output schema with its nested entries, 'min' for the bare schema.
+        :return: The modified entries, the deleted entry IDs and the date to use for the next synchronisation.
+        :raises: HTTPException with a 410 status code if the deletions since the date are no longer recorded."""
 
-                # Handle null values - convert string "null" to actual None/NULL
-                if param_value.lower() == "null":
-                    query = query.filter(column.is_(None))
-                    continue
+        schema, options, _ = get_view(view)
+        access_filters = get_access_filters(current_user)
 
-                # Handle different data types
-                try:
-                    # Try to convert to appropriate type based on column type
-                    if hasattr(column.type, "python_type"):
-                        if column.type.python_type == int:
-                            param_value = int(param_value)
-                        elif column.type.python_type == float:
-                            param_value = float(param_value)
-                        elif column.type.python_type == bool:
-                            param_value = param_value.lower() in ("true", "1", "yes", "on")
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.tombstone_retention_days)
+        if since < cutoff:
+            raise HTTPException(
+                status_code=status.HTTP_410_GONE,
+                detail=f"Changes older than {settings.tombstone_retention_days} days are not available",
+            )
 
-                    # Add filter to query
-                    query = query.filter(column == param_value)
+        # Read the date first so that the changes committed while reading are returned by the next synchronisation
+        until = db.scalar(OLDEST_TRANSACTION_START, {"max_age": settings.sync_max_transaction_seconds})
 
-                except (ValueError, TypeError):
-                    # If conversion fails, treat as string comparison
-                    query = query.filter(column == param_value)
+        # noinspection PyTypeChecker
+        entries = (
+            load_entries(db, options)
+            .filter(table_model.modified_at >= since, *access_filters)
+            .order_by(table_model.modified_at, table_model.id)
+            .all()
+        )
+
+        tombstone_filters = [
+            models.Tombstone.table_name == table_model.__tablename__,
+            models.Tombstone.created_at >= since,
+        ]
+        if not admin_only:
+            tombstone_filters.append(models.Tombstone.owner_id == current_user.id)
+        deleted = db.scalars(
+            select(models.Tombstone.entry_id).where(*tombstone_filters).order_by(models.Tombstone.created_at)
+        ).all()
 
-        return query.limit(limit).all()
+        return ModelResponse({"entries": entries, "deleted": deleted, "until": until}, schemas.ChangesOut[schema])
 
     # noinspection PyTypeHints
-    @router.get("/{entry_id}", response_model=out_schema)
+    @router.get("/{entry_id}", response_model=get_response_model)
     def get_one(
         entry_id: int,
+        request: Request,
+        response: Response,
         db: Session = Depends(database.get_db),
-        current_user: models.User = Depends(oauth2.get_current_user),
+        current_user: schemas.UserOut = Depends(oauth2.get_current_user),
+        view: Literal["full", "min"] = "full",
     ):
         """Get an entry by ID.
         :param entry_id: The entry ID.
+        :param request: FastAPI request object used to read the If-None-Match header.
+        :param response: FastAPI response object used to return the ETag header.
         :param db: The database session.
         :param current_user: The current user.
-        :returns: The entry if found.
+        :param view: Response view: 'full' for the output schema with its nested entries, 'min' for the bare schema.
+        :returns: The entry if found, or an empty 304 response if the entry matches the If-None-Match header.
         :raises: HTTPException with a 404 status code if the entry is not found.
         :raises: HTTPException with a 403 status code if not authorised to perform the requested action."""
 
+        schema, options, _ = get_view(view)
+        access_filters = get_access_filters(current_user)
+
+        # Skip loading the entry if the client copy is up to date
+        etag = get_etag(db, request, current_user, dependent_models[view], entry_id)
+        if is_not_modified(request, etag):
+            return not_modified_response(etag)
+
         # noinspection PyTypeChecker
-        entry = db.query(table_model).filter(table_model.id == entry_id).first()
+        entry = load_entries(db, options).filter(table_model.id == entry_id, *access_filters).first()
 
         if not entry:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found_msg)
+            raise_inaccessible_entries(db, [entry_id], [])
+        response.headers[ETAG_HEADER] = etag
 
-        if (entry.owner_id != current_user.id) or (admin_only and not current_user.is_admin):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Not authorised to perform requested action",
-            )
-
-        return entry
+        return ModelResponse(entry, schema, headers=response.headers)
 
     # noinspection PyTypeHints
     @router.post("/", status_code=status.HTTP_201_CREATED, response_model=out_schema)
     def create(
         item: create_schema,
         db: Session = Depends(database.get_db),
-        current_user: models.User = Depends(oauth2.get_current_user),
+        current_user: schemas.UserOut = Depends(oauth2.get_current_user),
     ):
         """Create a new entry.
         :param item: Data for the new entry.
@@ -207,16 +635,7 @@ def generate_data_table_crud_router(
             )
 
         # Extract the item data and exclude many-to-many fields from main creation
-        item_dict = item.model_dump()
-
-        # Remove many-to-many fields from main creation data
-        main_data = item_dict.copy()
-        m2m_data = {}
-
-        if many_to_many_fields:
-            for field_name in many_to_many_fields.keys():
-                if field_name in main_data:
-                    m2m_data[field_name] = main_data.pop(field_name)
+        main_data, m2m_data = split_many_to_many(item.model_dump())
 
         # Create the main entry
         new_entry = table_model(**main_data, owner_id=current_user.id)
@@ -226,11 +645,115 @@ def generate_data_table_crud_router(
 
         # Handle many-to-many relationships
         if m2m_data:
-            handle_many_to_many_create(db, new_entry.id, m2m_data)
+            handle_many_to_many_create(db, [(new_entry.id, m2m_data)])
+            invalidate_cache(db, current_user)
             db.commit()
-            db.refresh(new_entry)
 
-        return new_entry
+        # noinspection PyTypeChecker
+        entry = load_entries(db).filter(table_model.id == new_entry.id).first()
+        return ModelResponse(entry, out_schema, status_code=status.HTTP_201_CREATED)
+
+    # noinspection PyTypeHints
+    @router.post("/bulk", status_code=status.HTTP_201_CREATED, response_model=list[out_schema])
+    def create_bulk(
+        items: list[create_schema],
+        db: Session = Depends(database.get_db),
+        current_user: schemas.UserOut = Depends(oauth2.get_current_user),
+    ):
+        """Create several entries at once.
+        The entries are inserted with a multi-row INSERT ... RETURNING statement and their many-to-many relationships
+        with one executemany per association table, all in a single transaction.
+        :param items: Data for the new entries.
+        :param db: Database session.
+        :param current_user: Authenticated user.
+        :return: The created entries, in the same order as the items."""
+
+        if admin_only and not current_user.is_admin:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN, detail="Not authorised to perform requested action"
+            )
+
+        if not items:
+            return []
+
+        rows, m2m_rows = [], []
+        for item in items:
+            main_data, m2m_data = split_many_to_many(item.model_dump())
+            rows.append(dict(main_data, owner_id=current_user.id))
+            m2m_rows.append(m2m_data)
+
+        # Create the main entries
+        statement = insert(table_model).returning(table_model.id, sort_by_parameter_order=True)
+        new_ids = db.scalars(statement, rows).all()
+
+        # Handle many-to-many relationships
+        handle_many_to_many_create(db, list(zip(new_ids, m2m_rows)))
+        invalidate_cache(db, current_user)
+        db.commit()
+
+        # noinspection PyTypeChecker
+        entries = {entry.id: entry for entry in load_entries(db).filter(table_model.id.in_(new_ids))}
+        return ModelResponse(
+            [entries[entry_id] for entry_id in new_ids], list[out_schema], status_code=status.HTTP_201_CREATED
+        )
+
+    # noinspection PyTypeHints
+    @router.patch("/bulk", response_model=list[out_schema])
+    def update_bulk(
+        ids: list[int] = Body(),
+        item: update_schema = Body(),
+        db: Session = Depends(database.get_db),
+        current_user: schemas.UserOut = Depends(oauth2.get_current_user),
+    ):
+        """Apply the same update to several entries.
+        The entries are updated with a single ownership-filtered UPDATE ... RETURNING statement, and their many-to-many
+        relationships with one statement per association table. Either all the entries are updated or none are.
+        :param ids: IDs of the entries to update.
+        :param item: The updated data.
+        :param db: Database session.
+        :param current_user: Authenticated user.
+        :return: The updated entries, in the same order as the IDs.
+        :raises: HTTPException with a 404 status code if an entry is not found.
+        :raises: HTTPException with a 403 status code if not authorised to perform the requested action.
+        :raises: HTTPException with a 400 status code if no field is provided for the update."""
+
+        access_filters = get_access_filters(current_user)
+        item_dict = item.model_dump(exclude_unset=True)
+
+        if not item_dict:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields provided for update")
+
+        ids = list(dict.fromkeys(ids))
+        if not ids:
+            return []
+
+        update_entries(db, ids, item_dict, access_filters)
+        invalidate_cache(db, current_user)
+        db.commit()
+
+        # noinspection PyTypeChecker
+        entries = {entry.id: entry for entry in load_entries(db).filter(table_model.id.in_(ids))}
+        return ModelResponse([entries[entry_id] for entry_id in ids], list[out_schema])
+
+    @router.delete("/bulk", status_code=status.HTTP_204_NO_CONTENT)
+    def delete_bulk(
+        ids: list[int] = Query(),
+        db: Session = Depends(database.get_db),
+        current_user: schemas.UserOut = Depends(oauth2.get_current_user),
+    ):
+        """Delete several entries.
+        The many-to-many relationships are removed with one statement per association table and the entries with a
+        single ownership-filtered DELETE statement. Either all the entries are deleted or none are.
+        :param ids: IDs of the entries to delete.
+        :param db: Database session.
+        :param current_user: Authenticated user.
+        :raises: HTTPException with a 404 status code if an entry is not found.
+        :raises: HTTPException with a 403 status code if not authorised to perform the requested action."""
+
+        access_filters = get_access_filters(current_user)
+        delete_entries(db, list(dict.fromkeys(ids)), access_filters)
+        invalidate_cache(db, current_user)
+        db.commit()
 
     # noinspection PyTypeHints
     @router.put("/{entry_id}", response_model=out_schema)
@@ -238,7 +761,7 @@ def generate_data_table_crud_router(
         entry_id: int,
         item: update_schema,
         db: Session = Depends(database.get_db),
-        current_user: models.User = Depends(oauth2.get_current_user),
+        current_user: schemas.UserOut = Depends(oauth2.get_current_user),
     ):
         """Update an entry by ID.
         :param entry_id: The entry ID.
@@ -250,83 +773,40 @@ def generate_data_table_crud_router(
         :raises: HTTPException with a 403 status code if not authorised to perform the requested action.
         :raises: HTTPException with a 400 status code if no field is provided for the update."""
 
-        # noinspection PyTypeChecker
-        query = db.query(table_model).filter(table_model.id == entry_id)
-        entry = query.first()
-
-        if not entry:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found_msg)
-
-        if (entry.owner_id != current_user.id) or (admin_only and not current_user.is_admin):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Not authorised to perform requested action"
-            )
+        access_filters = get_access_filters(current_user)
 
         # Extract the item data
         item_dict = item.model_dump(exclude_unset=True)
 
         if not item_dict:
+            # noinspection PyTypeChecker
+            if db.scalar(select(table_model.id).where(table_model.id == entry_id, *access_filters)) is None:
+                raise_inaccessible_entries(db, [entry_id], [])
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="No fields provided for update")
 
-        # Separate main fields from many-to-many fields
-        main_data = item_dict.copy()
-        m2m_data = {}
-
-        if many_to_many_fields:
-            for field_name in many_to_many_fields.keys():
-                if field_name in main_data:
-                    m2m_data[field_name] = main_data.pop(field_name)
-
-        # Update main fields if any
-        if main_data:
-            query.update(main_data, synchronize_session=False)
-
-        # Handle many-to-many relationships
-        if m2m_data:
-            handle_many_to_many_update(db, entry_id, m2m_data)
-
+        update_entries(db, [entry_id], item_dict, access_filters)
+        invalidate_cache(db, current_user)
         db.commit()
 
         # Return the updated entry
-        return query.first()
+        # noinspection PyTypeChecker
+        return ModelResponse(load_entries(db).filter(table_model.id == entry_id).first(), out_schema)
 
     @router.delete("/{entry_id}", status_code=status.HTTP_204_NO_CONTENT)
     def delete(
         entry_id: int,
         db: Session = Depends(database.get_db),
-        current_user: models.User = Depends(oauth2.get_current_user),
+        current_user: schemas.UserOut = Depends(oauth2.get_current_user),
     ):
         """Delete an entry by ID.
         :param entry_id: The entry ID.
         :param db: The database session.
         :param current_user: The current user.
-        :returns: Dict with a deletion status message.
         :raises: HTTPException with a 404 status code if an entry is not found.
         :raises: HTTPException with a 403 status code if not authorised to perform the requested action."""
 
-        # noinspection PyTypeChecker
-        query = db.query(table_model).filter(table_model.id == entry_id)
-        entry = query.first()
-
-        if not entry:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=not_found_msg)
-
-        if (entry.owner_id != current_user.id) or (admin_only and not current_user.is_admin):
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN, detail="Not authorised to perform requested action"
-            )
-
-        # Delete many-to-many relationships first if they exist
-        if many_to_many_fields:
-            for field_name, m2m_config in many_to_many_fields.items():
-                association_table = m2m_config["table"]
-                local_key = m2m_config["local_key"]
-
-                db.execute(association_table.delete().where(getattr(association_table.c, local_key) == entry_id))
-
-        query.delete(synchronize_session=False)
+        delete_entries(db, [entry_id], get_access_filters(current_user))
+        invalidate_cache(db, current_user)
         db.commit()
 
-        return query
-
     return router
@@ -0,0 +1,133 @@
+"""API router returning all the entries and the dashboard of a user in a single normalised payload, used on the first
+page load"""
+
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Response
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app import models, database, oauth2, schemas
+from app.eis import models as eis_models
+from app.responses import json_response, to_columnar
+from app.routers.dashboard import get_dashboard_content
+
+router = APIRouter(prefix="/bootstrap", tags=["bootstrap"])
+
+# Table model, many-to-many fields and derived fields of each owned table, indexed by endpoint name
+# Many-to-many fields: {field name: (association table, local key, remote key)}
+# Derived fields: names of the hybrid properties read with their SQL expression (e.g. the job name)
+BOOTSTRAP_TABLES = {
+    "keywords": (models.Keyword, {}, ()),
+    "aggregators": (models.Aggregator, {}, ()),
+    "companies": (models.Company, {}, ()),
+    "locations": (models.Location, {}, ("name",)),
+    "persons": (models.Person, {}, ("name", "name_company")),
+    "files": (models.File, {}, ()),
+    "jobs": (
+        models.Job,
+        {
+            "keywords": (models.job_keyword_mapping, "job_id", "keyword_id"),
+            "contacts": (models.job_contact_mapping, "job_id", "person_id"),
+        },
+        ("name",),
+    ),
+    "interviews": (
+        models.Interview,
+        {"interviewers": (models.interview_interviewer_mapping, "interview_id", "person_id")},
+        (),
+    ),
+    "jobapplicationupdates": (models.JobApplicationUpdate, {}, ()),
+    "jobalertemails": (
+        eis_models.JobAlertEmail,
+        {"jobs": (eis_models.email_scrapedjob_mapping, "email_id", "job_id")},
+        (),
+    ),
+    "scrapedjobs": (eis_models.ScrapedJob, {}, ()),
+}
+
+# Columns which are too large to be bootstrapped and are fetched on demand (file content and email body)
+EXCLUDED_COLUMNS = {"content", "body"}
+
+
+def get_table_rows(
+    db: Session,
+    table_model,
+    many_to_many_fields: dict,
+    derived_fields: tuple[str, ...],
+    owner_id: int,
+) -> tuple[list[dict], list[str]]:
+    """Get the rows of a table owned by a user, with the foreign keys as IDs, the many-to-many relationships as lists
+    of IDs and the derived fields computed by the database. One query is used for the table and one per association
+    table.
+    :param db: Database session.
+    :param table_model: SQLAlchemy model class.
+    :param many_to_many_fields: Many-to-many fields of the table.
+    :param derived_fields: Names of the hybrid properties of the table.
+    :param owner_id: ID of the owner.
+    :return: The rows and the field names."""
+
+    columns = [column for column in table_model.__table__.columns if column.key not in EXCLUDED_COLUMNS]
+    columns += [getattr(table_model, field_name).label(field_name) for field_name in derived_fields]
+    owned_filter = table_model.owner_id == owner_id
+    rows = [dict(row) for row in db.execute(select(*columns).where(owned_filter).order_by(table_model.id)).mappings()]
+    fields = [column.key for column in columns]
+
+    for field_name, (association_table, local_key, remote_key) in many_to_many_fields.items():
+        local_column = getattr(association_table.c, local_key)
+        remote_column = getattr(association_table.c, remote_key)
+        owned_ids = select(table_model.id).where(owned_filter)
+        statement = select(local_column, remote_column).where(local_column.in_(owned_ids)).order_by(remote_column)
+        related_ids = {}
+        for local_id, remote_id in db.execute(statement):
+            related_ids.setdefault(local_id, []).append(remote_id)
+        for row in rows:
+            row[field_name] = related_ids.get(row["id"], [])
+        fields.append(field_name)
+
+    return rows, fields
+
+
+def get_dashboard_ids(dashboard: dict) -> schemas.BootstrapDashboardOut:
+    """Reference the entries of the dashboard data by ID, as they are already part of the bootstrap tables.
+    :param dashboard: Dashboard data returned by get_dashboard_content.
+    :return: The dashboard data with the jobs and interviews replaced by their IDs."""
+
+    return schemas.BootstrapDashboardOut(
+        statistics=dashboard["statistics"],
+        needs_chase=[job.id for job in dashboard["needs_chase"]],
+        all_updates=[
+            schemas.BootstrapDashboardUpdateOut(
+                id=update["data"].id, date=update["date"], type=update["type"], job_id=update["job"].id
+            )
+            for update in dashboard["all_updates"]
+        ],
+        upcoming_interviews=[interview.id for interview in dashboard["upcoming_interviews"]],
+        upcoming_deadlines=[job.id for job in dashboard["upcoming_deadlines"]],
+    )
+
+
+@router.get("/")
+def get_bootstrap(
+    encoding: Literal["json", "columnar"] = Query("json", alias="format"),
+    db: Session = Depends(database.get_db),
+    current_user: schemas.UserOut = Depends(oauth2.get_current_user),
+) -> Response:
+    """Get all the entries of the current user in a single normalised payload, along with the dashboard data. Related
+    entries are referenced by ID (e.g. `company_id`, `keywords`) instead of being nested, and the derived fields
+    displayed by the tables (e.g. the job `name`) are included.
+    :param encoding: Encoding of each table: 'json' for a list of objects, 'columnar' for a mapping of each field name to
+    the list of its values, which does not repeat the field names for each entry.
+    :param db: Database session.
+    :param current_user: Authenticated user.
+    :return: Dictionary mapping each table name to its entries, and `dashboard` to the dashboard data with the entries
+    referenced by ID."""
+
+    payload = {}
+    for table_name, (table_model, many_to_many_fields, derived_fields) in BOOTSTRAP_TABLES.items():
+        rows, fields = get_table_rows(db, table_model, many_to_many_fields, derived_fields, current_user.id)
+        payload[table_name] = to_columnar(rows, fields) if encoding == "columnar" else rows
+
+    payload["dashboard"] = get_dashboard_ids(get_dashboard_content(db, current_user))
+
+    return json_response(payload)
@@ -0,0 +1,62 @@
+"""Conditional GET helpers for the data table routers.
+
+The validator (ETag) of a response is derived from the number of entries, the latest modification date and a checksum of
+the modification dates of the tables read to build it, computed with a single query. The checksum changes with every
+write, including an update committed after a later one (whose modification date, the start of its transaction, is then
+older than the latest one). Requests sending a matching If-None-Match header are
+answered with 304 Not Modified before any entry is loaded or serialised."""
+
+import hashlib
+
+from fastapi import Response
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette import status
+from starlette.requests import Request
+
+ETAG_HEADER = "ETag"
+IF_NONE_MATCH_HEADER = "If-None-Match"
+
+
+def compute_etag(db: Session, table_models: list, owner_id: int | None, *parts) -> str:
+    """Compute the weak ETag of a response from the state of the tables it is built from.
+    :param db: Database session.
+    :param table_models: Models of the tables read to build the response.
+    :param owner_id: ID of the owner the entries are restricted to, or None to consider all the entries.
+    :param parts: Other values the response depends on (e.g. the user ID and the query parameters).
+    :return: The ETag value."""
+
+    columns = []
+    for table_model in table_models:
+        filters = (
+            [table_model.owner_id == owner_id] if owner_id is not None and hasattr(table_model, "owner_id") else []
+        )
+        columns.append(select(func.count()).select_from(table_model).where(*filters).scalar_subquery())
+        columns.append(select(func.max(table_model.modified_at)).where(*filters).scalar_subquery())
+        checksum = func.sum(func.hashtext(func.concat(table_model.id, "/", table_model.modified_at)))
+        columns.append(select(checksum).where(*filters).scalar_subquery())
+    state = db.execute(select(*columns)).one()
+
+    digest = hashlib.sha1(repr((tuple(state), parts)).encode("utf-8")).hexdigest()
+    return f'W/"{digest}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """Check whether the If-None-Match header of a request matches an ETag.
+    :param request: Request object.
+    :param etag: Current ETag of the requested resource.
+    :return: True if the client copy of the resource is up to date."""
+
+    if_none_match = request.headers.get(IF_NONE_MATCH_HEADER)
+    if not if_none_match:
+        return False
+    # Weak comparison: the W/ prefix is ignored
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return etag.removeprefix("W/") in tags
+
+
+def not_modified_response(etag: str) -> Response:
+    """Create an empty 304 Not Modified response.
+    :param etag: Current ETag of the requested resource."""
+
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={ETAG_HEADER: etag})
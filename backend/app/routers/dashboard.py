@@ -2,21 +2,43 @@
 
 from datetime import datetime, timedelta
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 from sqlalchemy import or_
 from sqlalchemy.orm import Session
+from starlette.requests import Request
 
 from app import models, database, oauth2, schemas
+from app.coalescing import coalesce_request
+from app.responses import ModelResponse
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 
-@router.get("/")
+@router.get("/", response_model=schemas.DashboardOut)
 def get_dashboard_data(
+    request: Request,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(oauth2.get_current_user),
-) -> dict:
+    current_user: schemas.UserOut = Depends(oauth2.get_current_user),
+) -> Response:
     """Get dashboard data including job applications, interviews, and job application updates.
+    Identical requests received while the dashboard of the user is being computed share its response.
+    :param request: Request object
+    :param db: Database session
+    :param current_user: Authenticated user"""
+
+    return coalesce_request(request, current_user.id, lambda: build_dashboard(db, current_user))
+
+
+def build_dashboard(db: Session, current_user: schemas.UserOut) -> ModelResponse:
+    """Build the dashboard response of a user.
+    :param db: Database session
+    :param current_user: Authenticated user"""
+
+    return ModelResponse(get_dashboard_content(db, current_user), schemas.DashboardOut)
+
+
+def get_dashboard_content(db: Session, current_user: schemas.UserOut) -> dict:
+    """Get the dashboard data of a user, to be validated with schemas.DashboardOut.
     :param db: Database session
     :param current_user: Authenticated user"""
 
@@ -24,6 +46,17 @@ def get_dashboard_data(
     chase_threshold = current_user.chase_threshold
     deadline_threshold = current_user.deadline_threshold
 
+    # Jobs are validated once, although they appear in several sections
+    job_outs = {}
+
+    def get_job_out(job: models.Job) -> schemas.JobOut:
+        """Get the validated output schema of a job.
+        :param job: Job entry."""
+
+        if job.id not in job_outs:
+            job_outs[job.id] = schemas.JobOut.model_validate(job, from_attributes=True)
+        return job_outs[job.id]
+
     # ---------------------------------------------------- ALL DATA ----------------------------------------------------
 
     # noinspection PyTypeChecker
@@ -63,7 +96,7 @@ def get_dashboard_data(
     needs_chase = []
     for job in job_application_pending:
         # Convert job application to Pydantic schema to access computed fields
-        job_schema = schemas.JobOut.model_validate(job, from_attributes=True)
+        job_schema = get_job_out(job)
 
         # If we have a last update date, check if it's older than the threshold
         if job_schema.days_since_last_update is not None:
@@ -77,7 +110,7 @@ def get_dashboard_data(
 
     # Add job applications as "Application" updates
     for job in job_applications:
-        job_out = schemas.JobOut.model_validate(job, from_attributes=True)
+        job_out = get_job_out(job)
         update_item = {
             "data": job_out,
             "date": job_out.application_date,
@@ -89,7 +122,7 @@ def get_dashboard_data(
     # Add interviews as "Interview" updates
     for interview in interviews:
         interview_out = schemas.InterviewOut.model_validate(interview, from_attributes=True)
-        job_out = schemas.JobOut.model_validate(interview.job, from_attributes=True)
+        job_out = get_job_out(interview.job)
         update_item = {
             "data": interview_out,
             "date": interview_out.date,
@@ -101,7 +134,7 @@ def get_dashboard_data(
     # Add job application updates
     for update in updates:
         update_out = schemas.JobApplicationUpdateOut.model_validate(update, from_attributes=True)
-        job_out = schemas.JobOut.model_validate(update.job, from_attributes=True)
+        job_out = get_job_out(update.job)
         update_item = {
             "data": update_out,
             "date": update_out.date,
@@ -131,7 +164,7 @@ def get_dashboard_data(
         .order_by(models.Job.deadline)
         .all()
     )
-    upcoming_deadlines = [schemas.JobOut.model_validate(job, from_attributes=True) for job in upcoming_deadlines]
+    upcoming_deadlines = [get_job_out(job) for job in upcoming_deadlines]
 
     return dict(
         statistics=statistics,
@@ -25,6 +25,7 @@ keyword_router = generate_data_table_crud_router(
     create_schema=schemas.KeywordCreate,
     update_schema=schemas.KeywordUpdate,
     out_schema=schemas.KeywordOut,
+    min_out_schema=schemas.KeywordMinOut,
     endpoint="keywords",
     not_found_msg="Keyword not found",
 )
@@ -35,6 +36,7 @@ aggregator_router = generate_data_table_crud_router(
     create_schema=schemas.AggregatorCreate,
     update_schema=schemas.AggregatorUpdate,
     out_schema=schemas.AggregatorOut,
+    min_out_schema=schemas.AggregatorMinOut,
     endpoint="aggregators",
     not_found_msg="Aggregator not found",
 )
@@ -45,6 +47,7 @@ company_router = generate_data_table_crud_router(
     create_schema=schemas.CompanyCreate,
     update_schema=schemas.CompanyUpdate,
     out_schema=schemas.CompanyOut,
+    min_out_schema=schemas.CompanyMinOut,
     endpoint="companies",
     not_found_msg="Company not found",
 )
@@ -55,6 +58,7 @@ location_router = generate_data_table_crud_router(
     create_schema=schemas.LocationCreate,
     update_schema=schemas.LocationUpdate,
     out_schema=schemas.LocationOut,
+    min_out_schema=schemas.LocationMinOut,
     endpoint="locations",
     not_found_msg="Location not found",
 )
@@ -65,6 +69,7 @@ person_router = generate_data_table_crud_router(
     create_schema=schemas.PersonCreate,
     update_schema=schemas.PersonUpdate,
     out_schema=schemas.PersonOut,
+    min_out_schema=schemas.PersonMinOut,
     endpoint="persons",
     not_found_msg="Person not found",
 )
@@ -75,8 +80,10 @@ job_router = generate_data_table_crud_router(
     create_schema=schemas.JobCreate,
     update_schema=schemas.JobUpdate,
     out_schema=schemas.JobOut,
+    min_out_schema=schemas.JobMinOut,
     endpoint="jobs",
     not_found_msg="Job not found",
+    sortable_fields=("created_at", "modified_at", "title", "deadline", "application_date", "salary_min", "salary_max"),
     many_to_many_fields={
         "keywords": {"table": models.job_keyword_mapping, "local_key": "job_id", "remote_key": "keyword_id"},
         "contacts": {"table": models.job_contact_mapping, "local_key": "job_id", "remote_key": "person_id"},
@@ -89,8 +96,10 @@ interview_router = generate_data_table_crud_router(
     create_schema=schemas.InterviewCreate,
     update_schema=schemas.InterviewUpdate,
     out_schema=schemas.InterviewOut,
+    min_out_schema=schemas.InterviewMinOut,
     endpoint="interviews",
     not_found_msg="Interview not found",
+    sortable_fields=("created_at", "modified_at", "date"),
     many_to_many_fields={
         "interviewers": {
             "table": models.interview_interviewer_mapping,
@@ -106,8 +115,10 @@ job_application_update_router = generate_data_table_crud_router(
     create_schema=schemas.JobApplicationUpdateCreate,
     update_schema=schemas.JobApplicationUpdateUpdate,
     out_schema=schemas.JobApplicationUpdateOut,
+    min_out_schema=schemas.JobApplicationUpdateAppOut,
     endpoint="jobapplicationupdates",
     not_found_msg="Job Application Update not found",
+    sortable_fields=("created_at", "modified_at", "date"),
 )
 
 # File router
@@ -125,7 +136,7 @@ file_router = generate_data_table_crud_router(
 def download_file(
         file_id: int,
         db: Session = Depends(database.get_db),
-        current_user: models.User = Depends(oauth2.get_current_user),
+        current_user: schemas.UserOut = Depends(oauth2.get_current_user),
 ):
     """Download a file by ID.
     :param file_id: The file ID.
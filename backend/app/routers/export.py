@@ -8,7 +8,7 @@ from fastapi import APIRouter, Depends
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app import database, oauth2
+from app import database, oauth2, schemas
 
 router = APIRouter(prefix="/export", tags=["export"])
 
@@ -29,7 +29,7 @@ MODEL_LIST = [
 @router.get("/")
 def export_jobs_with_all_columns(
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(oauth2.get_current_user),
+    current_user: schemas.UserOut = Depends(oauth2.get_current_user),
 ):
     """Export jobs with all columns (except IDs) and related data as a single CSV file."""
 
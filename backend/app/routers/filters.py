@@ -0,0 +1,129 @@
+"""Query parameter filters for the data table routers.
+
+Filters are written as `field=value` or `field__operator=value` (e.g. `deadline__gte=2025-01-01`, `id__in=1,2,3`,
+`salary_min__between=30000,50000`) and compiled into SQLAlchemy expressions. Only the whitelisted columns of a table can
+be filtered, and the value parser of each column is derived once from the column type when the router is built."""
+
+from datetime import date, datetime
+
+from fastapi import HTTPException
+from starlette import status
+
+OPERATOR_SEPARATOR = "__"
+LIST_SEPARATOR = ","
+
+
+def parse_bool(value: str) -> bool:
+    """Parse a boolean query parameter value.
+    :param value: String value.
+    :return: The boolean value."""
+
+    value = value.lower()
+    if value in ("true", "1", "yes", "on"):
+        return True
+    if value in ("false", "0", "no", "off"):
+        return False
+    raise ValueError(f"Invalid boolean value '{value}'")
+
+
+def get_value_parser(column):
+    """Get the function converting a query parameter string into the Python type of a column.
+    :param column: SQLAlchemy column.
+    :return: Parsing function."""
+
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return str
+
+    if python_type is bool:
+        return parse_bool
+    if python_type in (datetime, date):
+        return python_type.fromisoformat
+    if python_type in (int, float):
+        return python_type
+    return str
+
+
+def build_filter_parsers(table_model, filterable_fields: tuple[str, ...] | list[str] | None = None) -> dict:
+    """Build the column and value parser of each filterable field of a table.
+    :param table_model: SQLAlchemy model class.
+    :param filterable_fields: Whitelist of the filterable fields. All the table columns are filterable if None.
+    :return: Dictionary mapping each field name to its (column, value parser) pair."""
+
+    if filterable_fields is None:
+        filterable_fields = [column.key for column in table_model.__table__.columns]
+
+    parsers = {}
+    for field in filterable_fields:
+        column = getattr(table_model, field)
+        parsers[field] = (column, get_value_parser(column))
+    return parsers
+
+
+def compile_filter(column, parser, operator: str, value: str):
+    """Compile a single filter into a SQLAlchemy expression.
+    :param column: Filtered column.
+    :param parser: Value parsing function of the column.
+    :param operator: Filter operator.
+    :param value: Raw query parameter value.
+    :return: SQLAlchemy expression."""
+
+    if operator == "eq":
+        # Handle null values - convert string "null" to actual None/NULL
+        if value.lower() == "null":
+            return column.is_(None)
+        return column == parser(value)
+    if operator == "ne":
+        if value.lower() == "null":
+            return column.isnot(None)
+        return column != parser(value)
+    if operator == "gt":
+        return column > parser(value)
+    if operator == "gte":
+        return column >= parser(value)
+    if operator == "lt":
+        return column < parser(value)
+    if operator == "lte":
+        return column <= parser(value)
+    if operator == "in":
+        return column.in_([parser(item) for item in value.split(LIST_SEPARATOR)])
+    if operator == "ilike":
+        if parser is not str:
+            raise ValueError("Only text fields support the ilike operator")
+        return column.ilike(value)
+    if operator == "between":
+        bounds = value.split(LIST_SEPARATOR)
+        if len(bounds) != 2:
+            raise ValueError("Two comma-separated values are required")
+        return column.between(parser(bounds[0]), parser(bounds[1]))
+    raise KeyError(operator)
+
+
+def compile_filters(params: dict[str, str], parsers: dict) -> list:
+    """Compile query parameters into a list of SQLAlchemy filter expressions.
+    Parameters which do not refer to a filterable field are ignored, unless they use the operator syntax.
+    :param params: Query parameters.
+    :param parsers: Filterable fields, as returned by build_filter_parsers.
+    :return: List of SQLAlchemy expressions.
+    :raises: HTTPException with a 400 status code if a filter is invalid."""
+
+    filters = []
+    for param_name, value in params.items():
+        field, separator, operator = param_name.partition(OPERATOR_SEPARATOR)
+        if field not in parsers:
+            if separator:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Cannot filter by '{field}'")
+            continue
+
+        column, parser = parsers[field]
+        try:
+            filters.append(compile_filter(column, parser, operator or "eq", value))
+        except KeyError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown filter operator '{operator}'")
+        except (ValueError, TypeError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid value for filter '{param_name}': {e}"
+            )
+
+    return filters
@@ -0,0 +1,136 @@
+"""Eager-loading plans for the data table routers.
+
+The relationships serialised by an output schema are loaded up-front with one query per relationship (selectinload) or
+as part of the main query (joinedload), so that serialising a list of entries costs a fixed number of queries instead of
+one query per entry and relationship."""
+
+from typing import get_args
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import joinedload, selectinload
+
+from app import models
+
+# Relationships read by the hybrid properties exposed in the output schemas
+HYBRID_PROPERTY_DEPENDENCIES = {
+    (models.Person, "name_company"): ("company",),
+    (models.Job, "name"): ("company",),
+}
+
+
+def get_schema_model(annotation) -> type[BaseModel] | None:
+    """Get the Pydantic model of a field annotation such as list[JobOut] or CompanyMinOut | None.
+    :param annotation: Field annotation.
+    :return: The Pydantic model class, or None if the field is not a nested model."""
+
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+
+    for arg in get_args(annotation):
+        model = get_schema_model(arg)
+        if model is not None:
+            return model
+
+    return None
+
+
+def build_loader_options(
+    table_model,
+    schema: type[BaseModel],
+    many_to_one_loader=joinedload,
+    _path: tuple = (),
+) -> list:
+    """Build the loader options required to serialise entries of a table with an output schema.
+    Collections are loaded with selectinload and many-to-one relationships with joinedload, recursively following the
+    nested schemas.
+    :param table_model: SQLAlchemy model class.
+    :param schema: Pydantic output schema.
+    :param many_to_one_loader: Loader of the many-to-one relationships. selectinload is required when the rows are
+    read in batches (yield_per), which cannot be combined with joined eager loading.
+    :param _path: Schemas already visited, used to stop on recursive schemas.
+    :return: List of SQLAlchemy loader options."""
+
+    if not schema.__pydantic_complete__:
+        schema.model_rebuild()
+
+    mapper = inspect(table_model)
+    field_names = list(schema.model_fields)
+    for field_name in schema.model_fields:
+        field_names.extend(HYBRID_PROPERTY_DEPENDENCIES.get((table_model, field_name), ()))
+
+    options = []
+    for field_name in dict.fromkeys(field_names):
+        relationship = mapper.relationships.get(field_name)
+        if relationship is None:
+            continue
+
+        loader = selectinload if relationship.uselist else many_to_one_loader
+        option = loader(getattr(table_model, field_name))
+
+        # Load the relationships of the related entries
+        field = schema.model_fields.get(field_name)
+        nested_schema = get_schema_model(field.annotation) if field is not None else None
+        if nested_schema is not None and nested_schema not in _path:
+            nested_options = build_loader_options(
+                relationship.mapper.class_, nested_schema, many_to_one_loader, _path + (schema,)
+            )
+            if nested_options:
+                option = option.options(*nested_options)
+
+        options.append(option)
+
+    return options
+
+
+def get_loaded_models(table_model, schema: type[BaseModel], _path: tuple = ()) -> list:
+    """Get the models of all the tables read when serialising entries of a table with an output schema.
+    :param table_model: SQLAlchemy model class.
+    :param schema: Pydantic output schema.
+    :param _path: Schemas already visited, used to stop on recursive schemas.
+    :return: List of SQLAlchemy model classes, starting with table_model."""
+
+    if not schema.__pydantic_complete__:
+        schema.model_rebuild()
+
+    mapper = inspect(table_model)
+    table_models = [table_model]
+    for field_name, field in schema.model_fields.items():
+        relationship = mapper.relationships.get(field_name)
+        if relationship is None:
+            continue
+        nested_schema = get_schema_model(field.annotation)
+        if nested_schema is not None and nested_schema not in _path:
+            table_models.extend(get_loaded_models(relationship.mapper.class_, nested_schema, _path + (schema,)))
+        else:
+            table_models.append(relationship.mapper.class_)
+    for field_name in schema.model_fields:
+        for relationship_name in HYBRID_PROPERTY_DEPENDENCIES.get((table_model, field_name), ()):
+            table_models.append(mapper.relationships[relationship_name].mapper.class_)
+
+    return list(dict.fromkeys(table_models))
+
+
+def build_core_columns(table_model, schema: type[BaseModel], extra_fields: tuple[str, ...] = ()) -> list | None:
+    """Build the list of SQL columns from which the entries of a flat output schema can be built without loading
+    ORM objects. Hybrid properties are read from their SQL expression.
+    :param table_model: SQLAlchemy model class.
+    :param schema: Pydantic output schema.
+    :param extra_fields: Other table columns to select (e.g. the sort fields).
+    :return: List of labelled SQL columns, or None if the schema contains relationships or non-column fields."""
+
+    if not schema.__pydantic_complete__:
+        schema.model_rebuild()
+
+    mapper = inspect(table_model)
+    hybrid_names = [
+        name for name, descriptor in mapper.all_orm_descriptors.items() if isinstance(descriptor, hybrid_property)
+    ]
+    columns = {}
+    for field_name in (*schema.model_fields, *extra_fields):
+        if field_name in mapper.column_attrs or field_name in hybrid_names:
+            columns[field_name] = getattr(table_model, field_name).label(field_name)
+        else:
+            return None
+    return list(columns.values())
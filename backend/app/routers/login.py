@@ -5,9 +5,10 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
 
-from app import utils, models, database, schemas, oauth2
+from app import hashing, models, database, schemas, oauth2
+from app.throttling import throttle_login
 
-router = APIRouter(prefix="/login", tags=["Authentication"])
+router = APIRouter(prefix="/login", tags=["Authentication"], dependencies=[Depends(throttle_login)])
 
 
 @router.post("/", status_code=status.HTTP_200_OK, response_model=schemas.Token)
@@ -26,9 +27,13 @@ def login(
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="User not found")
 
     # Check that the password corresponds to that user
-    if not utils.verify_password(user_credentials.password, user.password):
+    if not hashing.verify_password(user_credentials.password, user.password):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Incorrect password")
 
+    # Hash the password again if the bcrypt cost has changed since it was hashed
+    if hashing.needs_rehash(user.password):
+        user.password = hashing.hash_password(user_credentials.password)
+
     # Update the user last login
     user.last_login = datetime.now(timezone.utc)
     db.commit()
@@ -0,0 +1,58 @@
+"""API router returning the ID and display name of the entries of several tables, used to populate the form selectors"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from starlette import status
+
+from app import models, database, oauth2, schemas
+
+router = APIRouter(prefix="/lookup", tags=["lookup"])
+
+# Table model and display name attribute of each table, indexed by endpoint name
+LOOKUP_TABLES = {
+    "keywords": (models.Keyword, "name"),
+    "aggregators": (models.Aggregator, "name"),
+    "companies": (models.Company, "name"),
+    "locations": (models.Location, "name"),
+    "persons": (models.Person, "name_company"),
+    "jobs": (models.Job, "name"),
+}
+
+
+@router.get("/", response_model=dict[str, list[schemas.LookupOut]])
+def get_lookup(
+    tables: str = Query(..., description="Comma-separated table names, e.g. 'companies,locations'"),
+    prefix: str | None = None,
+    limit: int | None = Query(None, ge=1),
+    db: Session = Depends(database.get_db),
+    current_user: schemas.UserOut = Depends(oauth2.get_current_user),
+) -> dict:
+    """Get the ID and display name of the entries of the requested tables, with a single query per table.
+    :param tables: Comma-separated names of the tables.
+    :param prefix: Optional case-insensitive prefix the display names must start with.
+    :param limit: Maximum number of entries returned per table.
+    :param db: Database session.
+    :param current_user: Authenticated user.
+    :return: Dictionary mapping each table name to its list of entries, sorted by display name.
+    :raises: HTTPException with a 400 status code if a table is not available."""
+
+    table_names = [table_name.strip() for table_name in tables.split(",") if table_name.strip()]
+    unknown_tables = [table_name for table_name in table_names if table_name not in LOOKUP_TABLES]
+    if unknown_tables:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown lookup tables: {', '.join(unknown_tables)}. Available tables: {', '.join(LOOKUP_TABLES)}",
+        )
+
+    lookup = {}
+    for table_name in dict.fromkeys(table_names):
+        table_model, name_attribute = LOOKUP_TABLES[table_name]
+        name = getattr(table_model, name_attribute).label("name")
+        query = select(table_model.id, name).where(table_model.owner_id == current_user.id)
+        if prefix:
+            query = query.where(name.istartswith(prefix, autoescape=True))
+        query = query.order_by(name, table_model.id).limit(limit)
+        lookup[table_name] = [{"id": row.id, "name": row.name} for row in db.execute(query)]
+
+    return lookup
@@ -0,0 +1,111 @@
+"""Keyset (cursor) pagination helpers for the data table routers.
+
+Pages are ordered by a whitelisted column followed by the primary key. Each page continues from the last row of the
+previous one (encoded in an opaque cursor token) instead of using an offset, so the cost of reading a page does not
+depend on how deep into the table the page is."""
+
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_, tuple_
+from starlette import status
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+def parse_order_by(order_by: str, sortable_fields: tuple[str, ...] | list[str]) -> list[tuple[str, bool]]:
+    """Parse a sort parameter such as 'created_at' or '-deadline,id'.
+    :param order_by: Comma-separated names of the sort fields, each prefixed with '-' for a descending order.
+    :param sortable_fields: Whitelist of the fields that can be used for sorting, in addition to the ID.
+    :return: List of (field name, descending) pairs.
+    :raises: HTTPException with a 400 status code if a field is not sortable."""
+
+    sort = []
+    for item in order_by.split(","):
+        item = item.strip()
+        descending = item.startswith("-")
+        field = item.lstrip("-")
+        if field != "id" and field not in sortable_fields:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cannot sort by '{field}'. Sortable fields: {', '.join(sortable_fields)}",
+            )
+        sort.append((field, descending))
+    return sort
+
+
+def encode_cursor(field: str, value, entry_id: int) -> str:
+    """Encode the position of the last entry of a page into an opaque cursor token.
+    :param field: Name of the sort field.
+    :param value: Value of the sort field for the last entry.
+    :param entry_id: ID of the last entry.
+    :return: URL-safe cursor token."""
+
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    payload = json.dumps([field, value, entry_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, field: str, column) -> tuple:
+    """Decode a cursor token generated by encode_cursor.
+    :param token: Cursor token.
+    :param field: Name of the sort field of the current request.
+    :param column: SQLAlchemy column of the sort field, used to restore the value type.
+    :return: The sort value and the ID of the last entry of the previous page.
+    :raises: HTTPException with a 400 status code if the token is invalid or was issued for another sort field."""
+
+    try:
+        padding = "=" * (-len(token) % 4)
+        cursor_field, value, entry_id = json.loads(base64.urlsafe_b64decode(token + padding))
+        if value is not None and column.type.python_type is datetime:
+            value = datetime.fromisoformat(value)
+        entry_id = int(entry_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+    if cursor_field != field:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cursor does not match the sort order")
+
+    return value, entry_id
+
+
+def keyset_order(column, id_column, descending: bool) -> list:
+    """Get the ORDER BY clauses of a keyset page. NULL values are always sorted last.
+    :param column: Sort column.
+    :param id_column: Primary key column, used as a tie-breaker.
+    :param descending: Whether the order is descending."""
+
+    if descending:
+        return [column.desc().nulls_last(), id_column.desc()]
+    return [column.asc().nulls_last(), id_column.asc()]
+
+
+def keyset_filter(column, id_column, value, entry_id: int, descending: bool):
+    """Get the WHERE clause selecting the entries located after the cursor position.
+    Non-nullable columns use a row-value comparison which maps directly onto a composite index range scan.
+    :param column: Sort column.
+    :param id_column: Primary key column.
+    :param value: Sort value of the last entry of the previous page.
+    :param entry_id: ID of the last entry of the previous page.
+    :param descending: Whether the order is descending."""
+
+    after_id = id_column < entry_id if descending else id_column > entry_id
+
+    # Only NULL values are left once the cursor has reached them
+    if value is None:
+        return and_(column.is_(None), after_id)
+
+    if descending:
+        after = tuple_(column, id_column) < tuple_(value, entry_id)
+    else:
+        after = tuple_(column, id_column) > tuple_(value, entry_id)
+
+    if column.nullable:
+        return or_(after, column.is_(None))
+    return after
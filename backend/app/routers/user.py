@@ -1,14 +1,98 @@
 """User route"""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status, Request
+from sqlalchemy import func, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
-from app import utils, models, oauth2, database, schemas
+from app import hashing, invalidation, models, oauth2, database, schemas
+from app.cache import TTLCache
+from app.config import settings
+from app.responses import ModelResponse
+from app.routers import RESERVED_QUERY_PARAMS
+from app.routers.filters import build_filter_parsers, compile_filters
+from app.routers.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    decode_cursor,
+    encode_cursor,
+    keyset_filter,
+    keyset_order,
+    parse_order_by,
+)
 
 user_router = APIRouter(prefix="/users", tags=["users"])
 
+# Columns the user list can be filtered and sorted by (the ID is always sortable)
+USER_FILTER_PARSERS = build_filter_parsers(
+    models.User, [column.key for column in models.User.__table__.columns if column.key != "password"]
+)
+USER_SORTABLE_FIELDS = ("email", "created_at", "modified_at", "last_login")
 
-def assert_admin(user: models.User) -> None:
+# Name of the setting listing the emails allowed to register
+ALLOWLIST_SETTING = "allowlist"
+
+# Registration allowlist, kept until the setting table is written to
+allowlist_cache = TTLCache(1, settings.allowlist_cache_ttl)
+
+
+def invalidate_allowlist(table_name: str, _owner_id: int | None) -> None:
+    """Evict the allowlist from the cache after a write to the setting table.
+    :param table_name: Name of the table written to.
+    :param _owner_id: ID of the user written to, or None for all users."""
+
+    if table_name == models.Setting.__tablename__:
+        allowlist_cache.clear()
+
+
+invalidation.subscribe(invalidate_allowlist, allowlist_cache.clear)
+
+
+def get_allowlist(db: Session) -> frozenset[str] | None:
+    """Get the lower-cased emails allowed to register.
+    :param db: The database session.
+    :return: The set of allowed emails, or None if the registration is open to all emails."""
+
+    cached = allowlist_cache.get(ALLOWLIST_SETTING)
+    if cached is not None:
+        return cached[0]
+
+    generation = allowlist_cache.generation
+    value = db.scalar(select(models.Setting.value).where(models.Setting.name == ALLOWLIST_SETTING))
+    allowlist = None if value is None else frozenset(email.strip().lower() for email in value.split(","))
+    # Wrapped in a tuple to distinguish an open registration from a cache miss
+    allowlist_cache.set(ALLOWLIST_SETTING, (allowlist,), generation)
+    return allowlist
+
+
+def is_email_registered(db: Session, email: str, exclude_id: int | None = None) -> bool:
+    """Check whether an email is used by a user, regardless of case, using the index on the lower-cased emails.
+    :param db: The database session.
+    :param email: The email to check.
+    :param exclude_id: ID of a user to ignore (e.g. the user being updated).
+    :return: True if another user has this email."""
+
+    query = select(models.User.id).where(func.lower(models.User.email) == email.lower())
+    if exclude_id is not None:
+        query = query.where(models.User.id != exclude_id)
+    return db.scalar(select(query.exists()))
+
+
+def commit_user(db: Session) -> None:
+    """Commit the creation or update of a user. The email is checked beforehand, so a user registered with the same
+    email by a concurrent request is only detected by the unique index on the lower-cased emails when committing.
+    :param db: The database session.
+    :raises: HTTPException with a 400 status code if the email is already registered."""
+
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
+
+
+def assert_admin(user: schemas.UserOut) -> None:
     """Check if the user is an admin.
     :param user: The user to check."""
 
@@ -19,68 +103,74 @@ def assert_admin(user: models.User) -> None:
 @user_router.get("/", response_model=list[schemas.UserOut])
 def get_all_users(
     request: Request,
+    response: Response,
     db: Session = Depends(database.get_db),
-    current_user: models.User = Depends(oauth2.get_current_user),
+    current_user: schemas.UserOut = Depends(oauth2.get_current_user),
+    limit: int | None = None,
+    page_size: int | None = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    order_by: str | None = None,
 ):
     """Retrieve all users.
+    Users can be filtered with `field=value` or `field__operator=value` query parameters (see app.routers.filters).
+    If page_size or cursor is provided, the users are returned one page at a time (keyset pagination) and the token of
+    the next page is returned in the X-Next-Cursor response header.
     :param request: FastAPI request object to access query parameters
+    :param response: FastAPI response object used to return the next page cursor.
     :param db: Database session.
     :param current_user: Authenticated user.
+    :param limit: Maximum number of users to return.
+    :param page_size: Number of users per page.
+    :param cursor: Cursor token returned with the previous page.
+    :param order_by: Sort field, prefixed with '-' for a descending order (e.g. '-last_login').
     :return: List of entries."""
 
     assert_admin(current_user)
 
-    # noinspection PyTypeChecker
-    query = db.query(models.User)
-
-    # Get all query parameters
+    # Apply filters for each parameter that matches a filterable column
     filter_params = dict(request.query_params)
+    for param_name in RESERVED_QUERY_PARAMS:
+        filter_params.pop(param_name, None)
+    # noinspection PyTypeChecker
+    query = db.query(models.User).filter(*compile_filters(filter_params, USER_FILTER_PARSERS))
 
-    # Apply filters for each parameter that matches a table column
-    for param_name, param_value in filter_params.items():
-        if hasattr(models.User, param_name):
-            column = getattr(models.User, param_name)
-
-            # Handle null values - convert string "null" to actual None/NULL
-            if param_value.lower() == "null":
-                query = query.filter(column.is_(None))
-                continue
+    sort = parse_order_by(order_by or "id", USER_SORTABLE_FIELDS)
+    if len(sort) > 1:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Users can only be sorted by one field")
+    sort_field, descending = sort[0]
+    sort_column = getattr(models.User, sort_field)
+    query = query.order_by(*keyset_order(sort_column, models.User.id, descending))
 
-            # Handle different data types
-            try:
-                # Try to convert to appropriate type based on column type
-                if hasattr(column.type, "python_type"):
-                    if column.type.python_type == int:
-                        param_value = int(param_value)
-                    elif column.type.python_type == float:
-                        param_value = float(param_value)
-                    elif column.type.python_type == bool:
-                        param_value = param_value.lower() in ("true", "1", "yes", "on")
+    if page_size is None and cursor is None:
+        return ModelResponse(query.limit(limit).all(), list[schemas.UserOut])
 
-                # Add filter to query
-                # noinspection PyTypeChecker
-                query = query.filter(column == param_value)
+    # Keyset pagination: resume after the last user of the previous page
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_field, sort_column)
+        query = query.filter(keyset_filter(sort_column, models.User.id, value, last_id, descending))
 
-            except (ValueError, TypeError):
-                # If conversion fails, treat as string comparison
-                # noinspection PyTypeChecker
-                query = query.filter(column == param_value)
+    size = page_size or DEFAULT_PAGE_SIZE
+    users = query.limit(size + 1).all()
+    if len(users) > size:
+        users = users[:size]
+        last = users[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(sort_field, getattr(last, sort_field), last.id)
 
-    return query.all()
+    return ModelResponse(users, list[schemas.UserOut], headers=response.headers)
 
 
 @user_router.get("/me", response_model=schemas.UserOut)
-def get_current_user_profile(current_user: models.User = Depends(oauth2.get_current_user)):
+def get_current_user_profile(current_user: schemas.UserOut = Depends(oauth2.get_current_user)):
     """Get the current user's profile.
     :param current_user: The current authenticated user."""
 
-    return current_user
+    return ModelResponse(current_user, schemas.UserOut)
 
 
 @user_router.get("/{entry_id}", response_model=schemas.UserOut)
 def get_one_user(
     entry_id: int | None,
-    current_user: models.User = Depends(oauth2.get_current_user),
+    current_user: schemas.UserOut = Depends(oauth2.get_current_user),
     db: Session = Depends(database.get_db),
 ):
     """Get a user by ID."""
@@ -91,13 +181,13 @@ def get_one_user(
     user = db.query(models.User).filter(models.User.id == entry_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return ModelResponse(user, schemas.UserOut)
 
 
 @user_router.put("/me", response_model=schemas.UserOut)
 def update_current_user_profile(
     user_update: schemas.UserUpdate,
-    current_user: models.User = Depends(oauth2.get_current_user),
+    current_user: schemas.UserOut = Depends(oauth2.get_current_user),
     db: Session = Depends(database.get_db),
 ):
     """Update the current user's profile.
@@ -109,7 +199,7 @@ def update_current_user_profile(
 
     # Hash password if it's being updated
     if "password" in user_update:
-        user_update["password"] = utils.hash_password(user_update["password"])
+        user_update["password"] = hashing.hash_password(user_update["password"])
 
     # Determine if the user is updating the password or email
     requires_password_check = "password" in user_update or "email" in user_update
@@ -120,30 +210,27 @@ def update_current_user_profile(
     current_password = user_update.get("current_password", "")
 
     # Update password/email
-    if requires_password_check and not utils.verify_password(current_password, user_db.password):
+    if requires_password_check and not hashing.verify_password(current_password, user_db.password):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="The current password is required")
 
     # Validate email
-    # noinspection PyTypeChecker
-    other_users = db.query(models.User).filter(models.User.id != current_user.id).all()
-    emails = [u.email for u in other_users]
-    if "email" in user_update and user_update["email"] in emails:
+    if "email" in user_update and is_email_registered(db, user_update["email"], current_user.id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
     # Update the user record
     for field, value in user_update.items():
         setattr(user_db, field, value)
 
-    db.commit()
+    commit_user(db)
     db.refresh(user_db)
-    return user_db
+    return ModelResponse(user_db, schemas.UserOut)
 
 
 @user_router.put("/{entry_id}", response_model=schemas.UserOut)
 def update_user(
     entry_id: int | None,
     user_update: schemas.UserUpdate,
-    current_user: models.User = Depends(oauth2.get_current_user),
+    current_user: schemas.UserOut = Depends(oauth2.get_current_user),
     db: Session = Depends(database.get_db),
 ):
     """Update a user by ID."""
@@ -154,26 +241,23 @@ def update_user(
 
     # Hash password if it's being updated
     if "password" in user_update:
-        user_update["password"] = utils.hash_password(user_update["password"])
+        user_update["password"] = hashing.hash_password(user_update["password"])
 
     # Get the user record to update
     # noinspection PyTypeChecker
     user_db = db.query(models.User).filter(models.User.id == entry_id).first()
 
     # Validate email
-    # noinspection PyTypeChecker
-    other_users = db.query(models.User).filter(models.User.id != entry_id).all()
-    emails = [u.email for u in other_users]
-    if "email" in user_update and user_update["email"] in emails:
+    if "email" in user_update and is_email_registered(db, user_update["email"], entry_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
     # Update the user record
     for field, value in user_update.items():
         setattr(user_db, field, value)
 
-    db.commit()
+    commit_user(db)
     db.refresh(user_db)
-    return user_db
+    return ModelResponse(user_db, schemas.UserOut)
 
 
 @user_router.post("/", status_code=201, response_model=schemas.UserOut)
@@ -185,24 +269,19 @@ def create_user(
     :param user: The user data.
     :param db: The database session."""
 
-    # noinspection PyTypeChecker
-    settings = db.query(models.Setting).filter(models.Setting.name == "allowlist").all()
-    if settings:
-        emails_allowed = settings[0].value.split(",")
-        if user.email not in emails_allowed:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Email not allowed")
-
-    # Get all users and check if the email is already registered
-    users = db.query(models.User).all()
-    emails = [u.email for u in users]
-    if user.email in emails:
+    allowlist = get_allowlist(db)
+    if allowlist is not None and user.email.lower() not in allowlist:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Email not allowed")
+
+    # Check if the email is already registered
+    if is_email_registered(db, user.email):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
     # Hash the password and create the user
-    user.password = utils.hash_password(user.password)
+    user.password = hashing.hash_password(user.password)
     # noinspection PyArgumentList
     new_user = models.User(**user.model_dump())
     db.add(new_user)
-    db.commit()
+    commit_user(db)
 
-    return new_user
+    return ModelResponse(new_user, schemas.UserOut, status_code=status.HTTP_201_CREATED)
@@ -407,9 +407,9 @@ class JobMinOut(OwnedOut):
     deadline: datetime | None
     note: str | None
     attendance_type: str | None
-    application_date: datetime
+    application_date: datetime | None = None
     application_url: str | None = None
-    application_status: str
+    application_status: str | None = None
     application_note: str | None = None
     applied_via: str | None = None
     name: str
@@ -507,3 +507,66 @@ class JobApplicationUpdateUpdate(JobApplicationUpdateCreate):
     date: datetime | None = None
     type: str | None = None
     job_id: int | None = None
+
+
+# ------------------------------------------------------- LOOKUP -------------------------------------------------------
+
+
+class LookupOut(BaseModel):
+    """Lookup output schema with the ID and display name of an entry"""
+
+    id: int
+    name: str
+
+
+# ------------------------------------------------------- CHANGES ------------------------------------------------------
+
+
+class ChangesOut[T](BaseModel):
+    """Changes output schema with the entries modified and the IDs of the entries deleted since a given date"""
+
+    entries: list[T]
+    deleted: list[int]
+    until: datetime
+
+
+# ------------------------------------------------------ DASHBOARD -----------------------------------------------------
+
+
+class DashboardUpdateOut(BaseModel):
+    """Dashboard update output schema"""
+
+    data: JobOut | InterviewOut | JobApplicationUpdateOut
+    date: datetime | None
+    type: str
+    job: JobOut
+
+
+class DashboardOut(BaseModel):
+    """Dashboard output schema"""
+
+    statistics: dict[str, int]
+    needs_chase: list[JobOut]
+    all_updates: list[DashboardUpdateOut]
+    upcoming_interviews: list[InterviewOut]
+    upcoming_deadlines: list[JobOut]
+
+
+class BootstrapDashboardUpdateOut(BaseModel):
+    """Bootstrap dashboard update output schema, referencing the job and the entry of the update (a job, an interview
+    or a job application update depending on the type) by ID"""
+
+    id: int
+    date: datetime | None
+    type: str
+    job_id: int
+
+
+class BootstrapDashboardOut(BaseModel):
+    """Bootstrap dashboard output schema, referencing the jobs and interviews by ID"""
+
+    statistics: dict[str, int]
+    needs_chase: list[int]
+    all_updates: list[BootstrapDashboardUpdateOut]
+    upcoming_interviews: list[int]
+    upcoming_deadlines: list[int]
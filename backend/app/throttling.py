@@ -0,0 +1,112 @@
+"""In-memory rate limiting of the login endpoint.
+
+Each failed or successful login costs a bcrypt verification, so the login attempts are limited per client IP address and
+per email with token buckets: a bucket holds up to `capacity` attempts and is refilled continuously at `rate` attempts
+per second. Requests over the limit are rejected with a 429 response before any database or bcrypt work is done."""
+
+import math
+import threading
+import time
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import OAuth2PasswordRequestForm
+from starlette.requests import Request
+
+from app.config import settings
+
+
+class TokenBucketLimiter:
+    """Thread-safe set of token buckets, one per key.
+    A bucket which has been idle long enough to be full again is equivalent to a missing bucket, so the idle buckets are
+    periodically removed to bound the memory usage."""
+
+    def __init__(self, capacity: float, rate: float, sweep_interval: float = 60.0) -> None:
+        """Initialise the limiter.
+        :param capacity: Maximum number of tokens of a bucket (burst size).
+        :param rate: Number of tokens added to a bucket per second.
+        :param sweep_interval: Minimum number of seconds between two removals of the idle buckets."""
+
+        self.capacity = capacity
+        self.rate = rate
+        self.sweep_interval = sweep_interval
+        self._buckets = {}
+        self._last_sweep = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, key) -> float:
+        """Take a token from the bucket of a key.
+        :param key: Bucket key (e.g. an IP address).
+        :return: 0 if a token was taken, otherwise the number of seconds until a token is available."""
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_sweep >= self.sweep_interval:
+                self._sweep(now)
+
+            tokens, updated_at = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated_at) * self.rate)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) / self.rate
+            self._buckets[key] = (tokens - 1, now)
+            return 0.0
+
+    def _sweep(self, now: float) -> None:
+        """Remove the buckets which are full again.
+        :param now: Current monotonic time."""
+
+        self._buckets = {
+            key: (tokens, updated_at)
+            for key, (tokens, updated_at) in self._buckets.items()
+            if (now - updated_at) * self.rate < self.capacity - tokens
+        }
+        self._last_sweep = now
+
+    def reset(self) -> None:
+        """Remove all the buckets."""
+
+        with self._lock:
+            self._buckets.clear()
+
+    def __len__(self) -> int:
+        """Number of buckets."""
+
+        return len(self._buckets)
+
+
+ip_limiter = TokenBucketLimiter(settings.login_ip_capacity, settings.login_ip_rate_per_minute / 60)
+email_limiter = TokenBucketLimiter(settings.login_email_capacity, settings.login_email_rate_per_minute / 60)
+
+
+def get_client_ip(request: Request) -> str | None:
+    """Get the IP address of the client of a request.
+    Each of the `trusted_proxy_count` proxies in front of the application appends the address it received the request
+    from to the X-Forwarded-For header, so the client address is the one appended by the first trusted proxy. The
+    addresses before it are set by the client and cannot be trusted.
+    :param request: Request object.
+    :return: The client IP address, or None if unknown."""
+
+    proxy_count = settings.trusted_proxy_count
+    if proxy_count > 0:
+        header = ",".join(request.headers.getlist("X-Forwarded-For"))
+        forwarded_for = [address.strip() for address in header.split(",")]
+        if len(forwarded_for) >= proxy_count and forwarded_for[-proxy_count]:
+            return forwarded_for[-proxy_count]
+    return request.client.host if request.client else None
+
+
+def throttle_login(request: Request, user_credentials: OAuth2PasswordRequestForm = Depends()) -> None:
+    """Reject the login attempts exceeding the limits of the client IP address or of the email.
+    :param request: Request object.
+    :param user_credentials: The user credentials (note: username is the email field).
+    :raises: HTTPException with a 429 status code and a Retry-After header if a limit is exceeded."""
+
+    client_ip = get_client_ip(request)
+    email = user_credentials.username.strip().lower()
+    retry_after = ip_limiter.acquire(client_ip) or email_limiter.acquire(email)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many login attempts, please try again later",
+            headers={"Retry-After": str(math.ceil(retry_after))},
+        )
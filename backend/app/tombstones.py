@@ -0,0 +1,68 @@
+"""Removal of the expired tombstones.
+
+The tombstones recorded by the database triggers are only read by the synchronisations of the last
+`tombstone_retention_days` days (older ones are rejected by the changes endpoints). Each worker deletes the older
+tombstones periodically in a background thread, so that the changes endpoints only read the database."""
+
+import threading
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Engine, delete
+from sqlalchemy.orm import Session
+
+from app import models
+from app.config import settings
+from app.utils import get_database_logger
+
+
+def prune_tombstones(engine: Engine) -> int:
+    """Delete the tombstones older than the retention period.
+    :param engine: Database engine.
+    :return: Number of deleted tombstones."""
+
+    cutoff = datetime.now(timezone.utc) - timedelta(days=settings.tombstone_retention_days)
+    with Session(engine) as db, db.begin():
+        result = db.execute(delete(models.Tombstone).where(models.Tombstone.created_at < cutoff))
+    return result.rowcount
+
+
+class TombstonePruner:
+    """Background thread deleting the expired tombstones when started, and then at regular intervals."""
+
+    def __init__(self, engine: Engine, interval: float = 3600.0) -> None:
+        """Initialise the pruner.
+        :param engine: Database engine.
+        :param interval: Number of seconds between two removals."""
+
+        self.engine = engine
+        self.interval = interval
+        self.logger = get_database_logger()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self) -> None:
+        """Start pruning in a background thread."""
+
+        if self.thread is not None and self.thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="tombstone-pruner", daemon=True)
+        self.thread.start()
+
+    def stop(self) -> None:
+        """Stop pruning and wait for the thread to finish."""
+
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join()
+            self.thread = None
+
+    def _run(self) -> None:
+        """Delete the expired tombstones every interval until stopped."""
+
+        while not self.stop_event.is_set():
+            try:
+                prune_tombstones(self.engine)
+            except Exception as exception:
+                self.logger.error(f"Tombstone pruning error: {exception}")
+            self.stop_event.wait(self.interval)
@@ -9,12 +9,13 @@ from typing import Optional
 import bcrypt
 
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: int = 12) -> str:
     """Hash a password for storing.
     :param password: password to hash
+    :param rounds: bcrypt cost factor (log2 of the number of iterations)
     :return: hashed password"""
 
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds)).decode("utf-8")
 
 
 def verify_password(password: str, hashed: str) -> bool:
@@ -26,6 +27,14 @@ def verify_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
 
 
+def get_hash_rounds(hashed: str) -> int:
+    """Get the bcrypt cost factor of a hashed password (e.g. 12 for $2b$12$...).
+    :param hashed: hashed password
+    :return: cost factor"""
+
+    return int(hashed.split("$")[2])
+
+
 class AppLogger:
     """Centralised logging utility"""
 
@@ -0,0 +1,69 @@
+"""Benchmark of the authentication overhead of a request: token verification and user lookup.
+
+Creates a temporary user in the test database and times oauth2.get_current_user with a token of this user:
+- uncached: both caches are cleared before each call, so the token is decoded and the user read from the database (the
+  former behaviour);
+- token cache: the user cache is cleared before each call, so only the user is read from the database;
+- token and user caches: both caches are warm.
+The user is deleted at the end.
+
+Usage (from the backend directory): python -m benchmarks.auth --calls 2000"""
+
+import argparse
+import time
+import uuid
+
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import database, models, oauth2
+
+
+def main() -> None:
+    """Run the benchmark"""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000, help="Number of calls of each path")
+    parser.add_argument("--url", default=database.SQLALCHEMY_DATABASE_URL + "_test", help="Database URL")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    session_local = sessionmaker(bind=engine)
+    with session_local() as db:
+        user_id = db.scalar(
+            insert(models.User)
+            .values(email=f"benchmark-{uuid.uuid4().hex}@example.com", password="benchmark-password")
+            .returning(models.User.id)
+        )
+        db.commit()
+    token = oauth2.create_access_token({"user_id": user_id})
+
+    def clear_all() -> None:
+        oauth2.token_cache.clear()
+        oauth2.user_cache.clear()
+
+    paths = (
+        ("uncached", clear_all),
+        ("token cache", oauth2.user_cache.clear),
+        ("token and user caches", lambda: None),
+    )
+    try:
+        for name, before_call in paths:
+            with session_local() as db:
+                oauth2.get_current_user(token, db)  # warm-up
+                duration = 0.0
+                for _ in range(args.calls):
+                    before_call()
+                    start = time.perf_counter()
+                    oauth2.get_current_user(token, db)
+                    duration += time.perf_counter() - start
+                    db.rollback()  # as the session of each request ends with its transaction
+            print(f"{name:>22}: {duration / args.calls * 1e6:.1f} µs per request")
+    finally:
+        with session_local() as db:
+            db.execute(delete(models.User).where(models.User.id == user_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
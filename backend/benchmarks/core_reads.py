@@ -0,0 +1,97 @@
+"""Benchmark of the list endpoint read paths: ORM objects vs rows selected with Core.
+
+Seeds a temporary user owning N jobs in the test database, then times reading and serialising the jobs with the min
+view, either by loading ORM objects (the path used for the nested views) or by selecting the schema columns (the path
+used for the flat views). The user and its entries are deleted at the end.
+
+Usage (from the backend directory): python -m benchmarks.core_reads --rows 10000 --repeat 5"""
+
+import argparse
+import time
+import uuid
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, delete, insert
+from sqlalchemy.orm import sessionmaker
+
+from app import database, models, schemas
+from app.routers.loading import build_core_columns, build_loader_options
+
+SCHEMA = schemas.JobMinOut
+
+
+def seed(db, rows: int) -> int:
+    """Create a user owning a company and a number of jobs.
+    :param db: Database session.
+    :param rows: Number of jobs.
+    :return: ID of the user."""
+
+    user_id = db.scalar(
+        insert(models.User)
+        .values(email=f"benchmark-{uuid.uuid4().hex}@example.com", password="benchmark-password")
+        .returning(models.User.id)
+    )
+    company_id = db.scalar(
+        insert(models.Company).values(name="Benchmark", owner_id=user_id).returning(models.Company.id)
+    )
+    jobs = [
+        {"title": f"Job {i}", "description": "Description " * 20, "company_id": company_id, "owner_id": user_id}
+        for i in range(rows)
+    ]
+    db.execute(insert(models.Job), jobs)
+    db.commit()
+    return user_id
+
+
+def read_orm(db, user_id: int) -> bytes:
+    """Read and serialise the jobs of a user from ORM objects."""
+
+    options = build_loader_options(models.Job, SCHEMA)
+    entries = db.query(models.Job).options(*options).filter(models.Job.owner_id == user_id).all()
+    adapter = TypeAdapter(list[SCHEMA])
+    return adapter.dump_json([SCHEMA.model_validate(entry, from_attributes=True) for entry in entries])
+
+
+def read_core(db, user_id: int) -> bytes:
+    """Read and serialise the jobs of a user from the selected columns."""
+
+    columns = build_core_columns(models.Job, SCHEMA)
+    rows = db.query(*columns).filter(models.Job.owner_id == user_id).all()
+    adapter = TypeAdapter(list[SCHEMA])
+    return adapter.dump_json([SCHEMA.model_validate(row._asdict()) for row in rows])
+
+
+def main() -> None:
+    """Run the benchmark"""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10000, help="Number of jobs")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of runs of each path")
+    parser.add_argument("--url", default=database.SQLALCHEMY_DATABASE_URL + "_test", help="Database URL")
+    args = parser.parse_args()
+
+    engine = create_engine(args.url)
+    session_local = sessionmaker(bind=engine)
+    with session_local() as db:
+        user_id = seed(db, args.rows)
+
+    try:
+        for name, read in (("ORM", read_orm), ("Core", read_core)):
+            durations = []
+            for _ in range(args.repeat):
+                with session_local() as db:
+                    start = time.perf_counter()
+                    content = read(db, user_id)
+                    durations.append(time.perf_counter() - start)
+            print(
+                f"{name:>4}: best {min(durations) * 1000:.1f} ms, mean {sum(durations) / len(durations) * 1000:.1f} ms"
+            )
+        print(f"{args.rows} rows, {len(content)} bytes")
+    finally:
+        with session_local() as db:
+            db.execute(delete(models.User).where(models.User.id == user_id))
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
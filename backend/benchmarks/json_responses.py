@@ -0,0 +1,91 @@
+"""Benchmark of the JSON response paths: FastAPI response_model validation vs cached TypeAdapter responses.
+
+Serves the same in-memory (transient) job entries through three endpoints of a throwaway FastAPI application:
+- response_model: entries returned as ORM objects and validated/serialised by FastAPI from the response_model;
+- jsonable_encoder: entries validated with model_validate in a Python loop and returned without response_model (the
+  former dashboard path);
+- ModelResponse: entries validated and serialised to bytes by the cached TypeAdapter (app.responses).
+No database is required.
+
+Usage (from the backend directory): python -m benchmarks.json_responses --rows 2000 --repeat 5"""
+
+import argparse
+import time
+from datetime import datetime, UTC
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app import models, schemas
+from app.responses import ModelResponse
+
+
+def create_jobs(rows: int) -> list[models.Job]:
+    """Create transient jobs with a company, a location and keywords.
+    :param rows: Number of jobs."""
+
+    now = datetime.now(UTC)
+    common = dict(created_at=now, modified_at=now, owner_id=1)
+    company = models.Company(id=1, name="Company", **common)
+    location = models.Location(id=1, city="Oxford", country="UK", **common)
+    keywords = [models.Keyword(id=i, name=f"Keyword {i}", **common) for i in range(5)]
+    return [
+        models.Job(
+            id=i,
+            title=f"Job {i}",
+            description="Description " * 20,
+            deadline=now,
+            company=company,
+            location=location,
+            keywords=keywords,
+            **common,
+        )
+        for i in range(rows)
+    ]
+
+
+def create_app(jobs: list[models.Job]) -> FastAPI:
+    """Create an application serving the jobs through each response path.
+    :param jobs: Jobs to serve."""
+
+    app = FastAPI()
+
+    @app.get("/response_model", response_model=list[schemas.JobOut])
+    def get_response_model():
+        return jobs
+
+    @app.get("/jsonable_encoder")
+    def get_jsonable_encoder() -> dict:
+        return {"jobs": [schemas.JobOut.model_validate(job, from_attributes=True) for job in jobs]}
+
+    @app.get("/model_response", response_model=list[schemas.JobOut])
+    def get_model_response():
+        return ModelResponse(jobs, list[schemas.JobOut])
+
+    return app
+
+
+def main() -> None:
+    """Run the benchmark"""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2000, help="Number of jobs")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of requests per path")
+    args = parser.parse_args()
+
+    client = TestClient(create_app(create_jobs(args.rows)))
+    for path in ("/response_model", "/jsonable_encoder", "/model_response"):
+        client.get(path)  # warm-up
+        durations = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            response = client.get(path)
+            durations.append(time.perf_counter() - start)
+        print(
+            f"{path:>18}: best {min(durations) * 1000:.1f} ms, mean {sum(durations) / len(durations) * 1000:.1f} ms, "
+            f"{len(response.content)} bytes"
+        )
+
+
+if __name__ == "__main__":
+    main()
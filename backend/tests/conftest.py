@@ -9,19 +9,22 @@ and providing the necessary utilities for seamless interactions with the applica
 """
 
 import datetime as dt
+from contextlib import contextmanager
 from typing import Any, Generator
 
 import pytest
 from fastapi import status
 from requests import Response
-from sqlalchemy import create_engine, orm
+from sqlalchemy import create_engine, event, orm
 from starlette.testclient import TestClient
 import os
 
 from app import models, database, schemas
+from app.invalidation import clear_all
 from app.eis import models as eis_models
 from app.main import app
 from app.oauth2 import create_access_token
+from app.throttling import email_limiter, ip_limiter
 from tests.utils.create_data import (
     create_users,
     create_companies,
@@ -54,6 +57,9 @@ def session() -> Generator[orm.Session, Any, None]:
     :yield: A new SQLAlchemy session bound to the test database."""
 
     reset_database(engine)
+    clear_all()
+    ip_limiter.reset()
+    email_limiter.reset()
     db = TestingSessionLocal()
     try:
         yield db
@@ -203,6 +209,23 @@ def test_settings(session) -> list[models.Setting]:
     return create_settings(session)
 
 
+@contextmanager
+def record_statements() -> Generator[list[str], Any, None]:
+    """Context manager recording the SQL statements executed on the test database.
+    :yield: The list of statements, filled as they are executed."""
+
+    statements = []
+
+    def record_statement(_conn, _cursor, statement, *_args) -> None:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+
 def open_file(filepath: str) -> str:
     """Helper function to open a text file from the resources directory.
     :param filepath: The name of the file located in the resources directory"""
@@ -335,6 +358,92 @@ class CRUDTestBase:
         response = self.get_all(client)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
+    def test_get_all_paginated(
+        self,
+        authorised_clients,
+        request,
+    ) -> None:
+        request.getfixturevalue(self.test_data)
+        expected_ids = [entry["id"] for entry in self.get_all(authorised_clients[0]).json()]
+
+        ids, cursor = [], None
+        while True:
+            params = {"page_size": 2} if cursor is None else {"page_size": 2, "cursor": cursor}
+            response = authorised_clients[0].get(self.endpoint, params=params)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.json()) <= 2
+            ids.extend(entry["id"] for entry in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert len(ids) == len(set(ids))
+        assert sorted(ids) == sorted(expected_ids)
+
+    def test_get_all_not_modified(
+        self,
+        authorised_clients,
+        request,
+    ) -> None:
+        request.getfixturevalue(self.test_data)
+        response = self.get_all(authorised_clients[0])
+        etag = response.headers["ETag"]
+
+        response = authorised_clients[0].get(self.endpoint, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+
+        # The ETag changes with the query parameters and the table content
+        response = authorised_clients[0].get(self.endpoint, params={"limit": 1}, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        # noinspection PyTypeChecker
+        self.put(authorised_clients[0], self.update_data["id"], self.update_data)
+        response = authorised_clients[0].get(self.endpoint, headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != etag
+
+    def test_get_one_not_modified(
+        self,
+        authorised_clients,
+        request,
+    ) -> None:
+        request.getfixturevalue(self.test_data)
+        # noinspection PyTypeChecker
+        entry_id = self.update_data["id"]
+        etag = self.get_one(authorised_clients[0], entry_id).headers["ETag"]
+
+        response = authorised_clients[0].get(f"{self.endpoint}/{entry_id}", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+        self.delete(authorised_clients[0], entry_id)
+        response = authorised_clients[0].get(f"{self.endpoint}/{entry_id}", headers={"If-None-Match": etag})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_get_changes(
+        self,
+        authorised_clients,
+        request,
+    ) -> None:
+        request.getfixturevalue(self.test_data)
+        since = (dt.datetime.now(dt.timezone.utc) - dt.timedelta(days=1)).isoformat()
+        response = authorised_clients[0].get(f"{self.endpoint}/changes", params={"since": since})
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        assert len(data["entries"]) == len(self.get_all(authorised_clients[0]).json())
+        assert data["deleted"] == []
+
+        # noinspection PyTypeChecker
+        entry_id = self.update_data["id"]
+        self.put(authorised_clients[0], entry_id, self.update_data)
+        data = authorised_clients[0].get(f"{self.endpoint}/changes", params={"since": data["until"]}).json()
+        assert [entry["id"] for entry in data["entries"]] == [entry_id]
+        assert data["deleted"] == []
+
+        self.delete(authorised_clients[0], entry_id)
+        data = authorised_clients[0].get(f"{self.endpoint}/changes", params={"since": data["until"]}).json()
+        assert data["entries"] == []
+        assert data["deleted"] == [entry_id]
+
     def test_get_one_success(
         self,
         authorised_clients,
@@ -387,6 +496,26 @@ class CRUDTestBase:
             assert response.status_code == status.HTTP_201_CREATED
             self.check_output(create_data, response.json())
 
+    def test_post_bulk_success(
+        self,
+        authorised_clients,
+    ) -> None:
+        create_data = [
+            {key: value for key, value in data.items() if key not in ("id", "owner_id")} for data in self.create_data
+        ]
+        response = authorised_clients[0].post(f"{self.endpoint}/bulk", json=create_data)
+        assert response.status_code == status.HTTP_201_CREATED
+        assert len(response.json()) == len(create_data)
+        for data, response_data in zip(create_data, response.json()):
+            self.check_output(data, response_data)
+
+    def test_post_bulk_unauthorized(
+        self,
+        client,
+    ) -> None:
+        response = client.post(f"{self.endpoint}/bulk", json=[])
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
     def test_post_unauthorized(
         self,
         client,
@@ -426,8 +555,52 @@ class CRUDTestBase:
         response = self.put(authorised_clients[1], test_data[0].id, {"name": "Test"})
         assert response.status_code == status.HTTP_403_FORBIDDEN
 
+    def test_patch_bulk_success(self, authorised_clients, request) -> None:
+        test_data = request.getfixturevalue(self.test_data)
+        ids = [entry.id for entry in test_data if entry.owner_id == test_data[0].owner_id][:3]
+        update_data = {key: value for key, value in self.update_data.items() if key != "id"}
+        response = authorised_clients[0].patch(f"{self.endpoint}/bulk", json={"ids": ids, "item": update_data})
+        assert response.status_code == status.HTTP_200_OK
+        assert [entry["id"] for entry in response.json()] == ids
+        for response_data in response.json():
+            self.check_output(update_data, response_data)
+
+    def test_patch_bulk_other_user(self, authorised_clients, request) -> None:
+        test_data = request.getfixturevalue(self.test_data)
+        update_data = {key: value for key, value in self.update_data.items() if key != "id"}
+        response = authorised_clients[1].patch(
+            f"{self.endpoint}/bulk", json={"ids": [test_data[0].id], "item": update_data}
+        )
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_patch_bulk_non_exist(self, authorised_clients, request) -> None:
+        test_data = request.getfixturevalue(self.test_data)
+        entry_id = test_data[0].id
+        expected = self.get_one(authorised_clients[0], entry_id).json()
+        update_data = {key: value for key, value in self.update_data.items() if key != "id"}
+        response = authorised_clients[0].patch(
+            f"{self.endpoint}/bulk", json={"ids": [entry_id, 999999], "item": update_data}
+        )
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+        assert self.get_one(authorised_clients[0], entry_id).json() == expected
+
     # ----------------------------------------------------- DELETE -----------------------------------------------------
 
+    def test_delete_bulk_success(self, authorised_clients, request) -> None:
+        test_data = request.getfixturevalue(self.test_data)
+        ids = [entry.id for entry in test_data if entry.owner_id == test_data[0].owner_id][:3]
+        response = authorised_clients[0].delete(f"{self.endpoint}/bulk", params={"ids": ids})
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        for entry_id in ids:
+            assert self.get_one(authorised_clients[0], entry_id).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_delete_bulk_other_user(self, authorised_clients, request) -> None:
+        test_data = request.getfixturevalue(self.test_data)
+        entry_id = test_data[0].id
+        response = authorised_clients[1].delete(f"{self.endpoint}/bulk", params={"ids": [entry_id]})
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        assert self.get_one(authorised_clients[0], entry_id).status_code == status.HTTP_200_OK
+
     def test_delete_success(self, authorised_clients, request) -> None:
         test_data = request.getfixturevalue(self.test_data)
         response = self.delete(authorised_clients[0], test_data[0].id)
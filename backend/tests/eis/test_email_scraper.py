@@ -4,6 +4,8 @@ import datetime
 from unittest.mock import MagicMock, patch
 
 import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
 
 from app.eis import schemas
 from app.eis.email_scraper import clean_email_address, get_user_id_from_email, GmailScraper
@@ -1255,3 +1257,18 @@ class TestScrapeRemainingJobs:
             # Count how many times scrape_job() was called
             scrape_job_call_count = mock_scraper_instance.scrape_job.call_count
             assert scrape_job_call_count == len(indeed_scraped_jobs)
+
+    def test_pending_jobs_index(self, session) -> None:
+        """Test that the pending jobs are read from the partial index."""
+
+        query = (
+            session.query(ScrapedJob)
+            .filter(ScrapedJob.is_scraped.is_(False))
+            .filter(ScrapedJob.is_failed.is_(False))
+            .filter(ScrapedJob.external_job_id == "123")
+        )
+        statement = str(query.statement.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+        session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = "\n".join(row[0] for row in session.execute(text(f"EXPLAIN {statement}")))
+        session.rollback()
+        assert "ix_scraped_job_pending" in plan
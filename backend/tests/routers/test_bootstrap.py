@@ -0,0 +1,95 @@
+"""Tests for bootstrap endpoint"""
+
+from app.routers.bootstrap import BOOTSTRAP_TABLES
+
+
+class TestBootstrap:
+
+    def test_bootstrap(
+        self,
+        authorised_clients,
+        test_users,
+        test_jobs,
+        test_interviews,
+        test_job_application_updates,
+        test_files,
+        test_scraped_jobs,
+    ) -> None:
+        """Test that the bootstrap returns the entries of the user with the relationships as IDs, and the dashboard"""
+
+        response = authorised_clients[0].get("/bootstrap")
+        assert response.status_code == 200
+        data = response.json()
+        assert list(data) == [*BOOTSTRAP_TABLES, "dashboard"]
+
+        dashboard = authorised_clients[0].get("/dashboard").json()
+        assert data["dashboard"] == {
+            "statistics": dashboard["statistics"],
+            "needs_chase": [job["id"] for job in dashboard["needs_chase"]],
+            "all_updates": [
+                {
+                    "id": update["data"]["id"],
+                    "date": update["date"],
+                    "type": update["type"],
+                    "job_id": update["job"]["id"],
+                }
+                for update in dashboard["all_updates"]
+            ],
+            "upcoming_interviews": [interview["id"] for interview in dashboard["upcoming_interviews"]],
+            "upcoming_deadlines": [job["id"] for job in dashboard["upcoming_deadlines"]],
+        }
+        assert data["dashboard"]["all_updates"]
+
+        for table_name in BOOTSTRAP_TABLES:
+            entries = authorised_clients[0].get(f"/{table_name}").json()
+            assert [row["id"] for row in data[table_name]] == sorted(entry["id"] for entry in entries)
+            assert all(row["owner_id"] == test_users[0].id for row in data[table_name])
+
+        jobs = {job["id"]: job for job in authorised_clients[0].get("/jobs").json()}
+        for row in data["jobs"]:
+            assert row["keywords"] == sorted(keyword["id"] for keyword in jobs[row["id"]]["keywords"])
+            assert row["contacts"] == sorted(person["id"] for person in jobs[row["id"]]["contacts"])
+            assert "company" not in row
+        assert all("content" not in row for row in data["files"])
+        assert all("body" not in row for row in data["jobalertemails"])
+
+        emails = {email["id"]: email for email in authorised_clients[0].get("/jobalertemails").json()}
+        for row in data["jobalertemails"]:
+            assert row["jobs"] == sorted(job["id"] for job in emails[row["id"]]["jobs"])
+
+    def test_bootstrap_derived_fields(self, authorised_clients, test_jobs, test_persons, test_locations) -> None:
+        """Test that the derived fields are the same as those of the list endpoints"""
+
+        data = authorised_clients[0].get("/bootstrap").json()
+        for table_name, fields in [("jobs", ["name"]), ("persons", ["name", "name_company"]), ("locations", ["name"])]:
+            entries = {entry["id"]: entry for entry in authorised_clients[0].get(f"/{table_name}").json()}
+            assert data[table_name]
+            for row in data[table_name]:
+                assert {field: row[field] for field in fields} == {field: entries[row["id"]][field] for field in fields}
+
+    def test_bootstrap_columnar(self, authorised_clients, test_jobs, test_interviews) -> None:
+        """Test that the columnar encoding contains the same data as the JSON encoding"""
+
+        rows = authorised_clients[0].get("/bootstrap").json()
+        response = authorised_clients[0].get("/bootstrap", params={"format": "columnar"})
+        assert response.status_code == 200
+        columns = response.json()
+
+        assert columns["dashboard"] == rows["dashboard"]
+        for table_name in BOOTSTRAP_TABLES:
+            table_rows = rows[table_name]
+            fields = list(columns[table_name])
+            assert all(len(values) == len(table_rows) for values in columns[table_name].values())
+            assert [dict(zip(fields, values)) for values in zip(*columns[table_name].values())] == table_rows
+
+    def test_bootstrap_other_user(self, authorised_clients, test_users, test_jobs) -> None:
+        """Test that only the entries of the current user are returned"""
+
+        data = authorised_clients[1].get("/bootstrap").json()
+        assert all(row["owner_id"] == test_users[1].id for row in data["jobs"])
+
+    def test_bootstrap_unauthorised(self, client) -> None:
+        """Test that the bootstrap requires authentication"""
+
+        response = client.get("/bootstrap")
+        assert response.status_code == 401
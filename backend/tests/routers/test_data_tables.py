@@ -8,8 +8,16 @@ from CRUDTestBase to ensure consistent testing of standard CRUD operations, incl
 validation, and error handling. Additional custom endpoint tests are included where applicable.
 """
 
-from app import schemas
-from tests.conftest import CRUDTestBase
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import func, select, update
+
+from app import models, schemas
+from app.config import settings
+from tests.conftest import CRUDTestBase, TestingSessionLocal, record_statements
 from tests.utils.table_data import (
     COMPANY_DATA,
     LOCATION_DATA,
@@ -219,6 +227,348 @@ class TestJobCRUD(CRUDTestBase):
         "id": 1,
     }
 
+    def test_get_all_paginated_nullable_descending(self, authorised_clients, test_jobs) -> None:
+        """Test keyset pagination on a nullable sort column, in descending order"""
+
+        expected = authorised_clients[0].get(self.endpoint, params={"order_by": "-deadline"}).json()
+
+        jobs, cursor = [], None
+        while True:
+            params = {"page_size": 3, "order_by": "-deadline"}
+            if cursor:
+                params["cursor"] = cursor
+            response = authorised_clients[0].get(self.endpoint, params=params)
+            assert response.status_code == 200
+            jobs.extend(response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if cursor is None:
+                break
+
+        assert [job["id"] for job in jobs] == [job["id"] for job in expected]
+        deadlines = [job["deadline"] for job in jobs if job["deadline"] is not None]
+        assert deadlines == sorted(deadlines, reverse=True)
+        assert all(job["deadline"] is None for job in jobs[len(deadlines) :])
+
+    def test_post_bulk_many_to_many(self, authorised_clients, test_keywords, test_persons) -> None:
+        """Test bulk creation of jobs with keywords and contacts"""
+
+        create_data = [
+            {"title": "Job A", "keywords": [1, 2], "contacts": [1]},
+            {"title": "Job B"},
+            {"title": "Job C", "keywords": [3], "contacts": [1, 2]},
+        ]
+        response = authorised_clients[0].post(f"{self.endpoint}/bulk", json=create_data)
+        assert response.status_code == 201
+
+        jobs = response.json()
+        assert [job["title"] for job in jobs] == ["Job A", "Job B", "Job C"]
+        assert [sorted(keyword["id"] for keyword in job["keywords"]) for job in jobs] == [[1, 2], [], [3]]
+        assert [sorted(contact["id"] for contact in job["contacts"]) for job in jobs] == [[1], [], [1, 2]]
+
+    def test_patch_bulk_many_to_many(self, authorised_clients, test_jobs) -> None:
+        """Test bulk update of the job keywords"""
+
+        response = authorised_clients[0].patch(
+            f"{self.endpoint}/bulk", json={"ids": [1, 2], "item": {"keywords": [3], "application_status": "closed"}}
+        )
+        assert response.status_code == 200
+        for job in response.json():
+            assert [keyword["id"] for keyword in job["keywords"]] == [3]
+            assert job["application_status"] == "closed"
+
+    def test_delete_bulk_many_to_many(self, authorised_clients, test_jobs, session) -> None:
+        """Test bulk deletion of jobs with keywords and contacts"""
+
+        response = authorised_clients[0].delete(f"{self.endpoint}/bulk", params={"ids": [1, 2]})
+        assert response.status_code == 204
+        assert (
+            session.query(models.job_keyword_mapping).filter(models.job_keyword_mapping.c.job_id.in_([1, 2])).count()
+            == 0
+        )
+
+    def test_put_many_to_many_diff(self, authorised_clients, test_jobs, session) -> None:
+        """Test that updating the job keywords only writes the added and removed mappings"""
+
+        with record_statements() as statements:
+            response = self.put(authorised_clients[0], 1, {"keywords": [1, 2, 6, 8]})
+
+        assert response.status_code == 200
+        assert sorted(keyword["id"] for keyword in response.json()["keywords"]) == [1, 2, 6, 8]
+
+        mapping_writes = [s for s in statements if "job_keyword_mapping" in s and not s.startswith("SELECT")]
+        assert len(mapping_writes) == 2
+        assert "keyword_id IN" in mapping_writes[0]  # only keyword 7 is removed
+        assert mapping_writes[1].startswith("INSERT")  # only keyword 8 is added
+
+    def test_put_single_statement(self, authorised_clients, test_jobs) -> None:
+        """Test that the ownership check and the update are performed by the same statement"""
+
+        with record_statements() as statements:
+            response = self.put(authorised_clients[0], 1, {"title": "Updated title"})
+
+        assert response.status_code == 200
+        statements = [statement for statement in statements if 'FROM "user"' not in statement]  # authentication
+        assert statements[0].startswith("UPDATE job SET") and "owner_id" in statements[0]
+        assert not any(statement.startswith(("UPDATE", "DELETE", "INSERT")) for statement in statements[1:])
+
+    def test_get_all_constant_query_count(
+        self, authorised_clients, test_jobs, test_interviews, test_job_application_updates
+    ) -> None:
+        """Test that the number of queries of the list endpoint does not depend on the number of entries"""
+
+        with record_statements() as statements:
+            response = authorised_clients[0].get(self.endpoint, params={"limit": 1})
+        assert len(response.json()) == 1
+        single_count = len([statement for statement in statements if 'FROM "user"' not in statement])  # authentication
+
+        with record_statements() as statements:
+            response = authorised_clients[0].get(self.endpoint)
+        assert len(response.json()) > 1
+        assert len([statement for statement in statements if 'FROM "user"' not in statement]) == single_count
+
+    def test_get_min_view(self, authorised_clients, test_jobs, test_interviews) -> None:
+        """Test that the min view returns the bare job schema without loading the nested entries"""
+
+        with record_statements() as statements:
+            response = authorised_clients[0].get(self.endpoint, params={"view": "min"})
+        assert response.status_code == 200
+        jobs = response.json()
+        assert jobs and all("interviews" not in job and "company" not in job for job in jobs)
+        assert all("name" in job for job in jobs)
+        assert not any("FROM interview" in statement for statement in statements)
+
+        response = authorised_clients[0].get(f"{self.endpoint}/1", params={"view": "min"})
+        assert response.status_code == 200
+        assert set(response.json()) == set(schemas.JobMinOut.model_fields)
+
+        response = authorised_clients[0].get(f"{self.endpoint}/1")
+        assert "interviews" in response.json()
+
+        response = authorised_clients[0].get(self.endpoint, params={"view": "unknown"})
+        assert response.status_code == 422
+
+    def test_get_all_not_modified_related(self, authorised_clients, test_jobs, test_interviews) -> None:
+        """Test that the ETag of the job list changes when a nested interview is updated"""
+
+        etag = authorised_clients[0].get(self.endpoint).headers["ETag"]
+        response = authorised_clients[0].put(f"/interviews/{test_interviews[0].id}", json={"note": "Updated note"})
+        assert response.status_code == 200
+
+        response = authorised_clients[0].get(self.endpoint, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    def test_get_all_not_modified_late_commit(self, authorised_clients, test_jobs, session) -> None:
+        """Test that the ETag of the job list changes when an update is committed with an older modification date than
+        the latest one, as an update whose transaction started before another one but committed after it"""
+
+        latest = max(job.modified_at for job in test_jobs if job.owner_id == 1)
+        etag = authorised_clients[0].get(self.endpoint).headers["ETag"]
+        job = session.get(models.Job, next(job.id for job in test_jobs if job.owner_id == 1))
+        job.title = "Updated title"
+        job.modified_at = latest - timedelta(seconds=1)
+        session.commit()
+
+        response = authorised_clients[0].get(self.endpoint, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+
+    @pytest.mark.parametrize(
+        "params, foreign_key, endpoint",
+        [
+            ({"format": "columnar"}, "company_id", "/companies"),
+            ({"view": "min"}, "location_id", "/locations"),
+        ],
+    )
+    def test_get_all_not_modified_referenced(
+        self, authorised_clients, test_jobs, params, foreign_key, endpoint
+    ) -> None:
+        """Test that the ETag of the job list changes when an entry referenced by a job is deleted"""
+
+        job = next(job for job in test_jobs if job.owner_id == 1 and getattr(job, foreign_key) is not None)
+        referenced_id = getattr(job, foreign_key)
+        etag = authorised_clients[0].get(self.endpoint, params=params).headers["ETag"]
+        assert authorised_clients[0].delete(f"{endpoint}/{referenced_id}").status_code == 204
+
+        response = authorised_clients[0].get(self.endpoint, params=params, headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        response = authorised_clients[0].get(f"{self.endpoint}/{job.id}", params=params)
+        assert response.json()[foreign_key] is None
+
+    def test_get_changes_cascade(self, authorised_clients, test_jobs, test_interviews) -> None:
+        """Test that the interviews deleted with their job are returned as deleted"""
+
+        since = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        until = authorised_clients[0].get("/interviews/changes", params={"since": since}).json()["until"]
+        interview_ids = [interview.id for interview in test_interviews if interview.job_id == 1]
+        assert interview_ids
+
+        assert self.delete(authorised_clients[0], 1).status_code == 204
+        data = authorised_clients[0].get("/interviews/changes", params={"since": until}).json()
+        assert sorted(data["deleted"]) == sorted(interview_ids)
+
+    def test_get_changes_in_progress(self, authorised_clients, test_jobs, session) -> None:
+        """Test that an entry written by a transaction in progress during a synchronisation is returned by the next one"""
+
+        since = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        with TestingSessionLocal() as other_session:
+            other_session.execute(update(models.Job).where(models.Job.id == 1).values(title="Updated title"))
+            session.rollback()  # the synchronisation transaction starts after the write
+            until = authorised_clients[0].get(f"{self.endpoint}/changes", params={"since": since}).json()["until"]
+            other_session.commit()
+
+        data = authorised_clients[0].get(f"{self.endpoint}/changes", params={"since": until}).json()
+        assert {"id": 1, "title": "Updated title"}.items() <= next(e for e in data["entries"] if e["id"] == 1).items()
+
+    def test_get_changes_long_transaction(self, authorised_clients, test_jobs, session, monkeypatch) -> None:
+        """Test that a transaction in progress for longer than the limit does not hold the synchronisations back"""
+
+        since = (datetime.now(timezone.utc) - timedelta(days=1)).isoformat()
+        with TestingSessionLocal() as other_session:
+            started_at = other_session.scalar(select(func.now()))  # idle in transaction
+            session.rollback()
+            time.sleep(0.1)
+            until = authorised_clients[0].get(f"{self.endpoint}/changes", params={"since": since}).json()["until"]
+            assert datetime.fromisoformat(until) == started_at
+
+            monkeypatch.setattr(settings, "sync_max_transaction_seconds", 0.05)
+            until = authorised_clients[0].get(f"{self.endpoint}/changes", params={"since": since}).json()["until"]
+            assert datetime.fromisoformat(until) > started_at
+
+    def test_get_changes_expired(self, authorised_clients, test_jobs) -> None:
+        """Test that the synchronisations older than the tombstone retention period are rejected"""
+
+        old_date = datetime.now(timezone.utc) - timedelta(days=settings.tombstone_retention_days + 1)
+        response = authorised_clients[0].get(f"{self.endpoint}/changes", params={"since": old_date.isoformat()})
+        assert response.status_code == 410
+
+    def test_get_all_columnar(self, authorised_clients, test_jobs) -> None:
+        """Test that the columnar format contains the table columns of the same entries as the JSON format"""
+
+        params = {"order_by": "-deadline", "salary_min__gte": 0}
+        jobs = authorised_clients[0].get(self.endpoint, params=params).json()
+        response = authorised_clients[0].get(self.endpoint, params={**params, "format": "columnar"})
+        assert response.status_code == 200
+        columns = response.json()
+        assert list(columns) == [column.key for column in models.Job.__table__.columns]
+        assert columns["id"] == [job["id"] for job in jobs]
+        assert columns["title"] == [job["title"] for job in jobs]
+
+        response = authorised_clients[0].get(self.endpoint, params={"format": "columnar", "page_size": 2})
+        assert len(response.json()["id"]) == 2
+        assert "X-Next-Cursor" in response.headers and "ETag" in response.headers
+
+        response = authorised_clients[0].get(self.endpoint, params={"format": "columnar", "title": "Unknown"})
+        assert response.json()["id"] == []
+
+    def test_get_all_ndjson(self, authorised_clients, test_jobs, test_interviews) -> None:
+        """Test that the streamed entries are the same as the JSON entries"""
+
+        headers = {"Accept": "application/x-ndjson"}
+        params = {"order_by": "-deadline"}
+        jobs = authorised_clients[0].get(self.endpoint, params=params).json()
+        response = authorised_clients[0].get(self.endpoint, params=params, headers=headers)
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        streamed = [json.loads(line) for line in response.text.splitlines()]
+        assert [job["id"] for job in streamed] == [job["id"] for job in jobs]
+        for streamed_job, job in zip(streamed, jobs):
+            # The relationships are not ordered
+            for key, value in job.items():
+                if isinstance(value, list):
+                    assert sorted(item["id"] for item in streamed_job[key]) == sorted(item["id"] for item in value)
+                else:
+                    assert streamed_job[key] == value
+
+        response = authorised_clients[0].get(self.endpoint, params={**params, "format": "columnar"}, headers=headers)
+        assert [json.loads(line)["id"] for line in response.text.splitlines()] == [job["id"] for job in jobs]
+
+        response = authorised_clients[0].get(self.endpoint, params={"page_size": 2}, headers=headers)
+        assert len(response.text.splitlines()) == 2
+        assert "X-Next-Cursor" in response.headers
+
+    def test_get_all_core_reads(self, authorised_clients, test_jobs) -> None:
+        """Test that the min view entries built from the selected columns match the entries built from ORM objects"""
+
+        with record_statements() as statements:
+            jobs = authorised_clients[0].get(self.endpoint, params={"view": "min", "order_by": "title"}).json()
+        statements = [statement for statement in statements if 'FROM "user"' not in statement]  # authentication
+        assert len(statements) == 2  # ETag and entries
+
+        assert [job["title"] for job in jobs] == sorted(job["title"] for job in jobs)
+        for job in jobs:
+            assert job == authorised_clients[0].get(f"{self.endpoint}/{job['id']}", params={"view": "min"}).json()
+
+    def test_get_all_cached(self, authorised_clients, test_jobs, test_interviews) -> None:
+        """Test that the list responses are served from the cache until a table they depend on is written to"""
+
+        jobs = authorised_clients[0].get(self.endpoint).json()
+        hits = authorised_clients[0].get("/health/cache").json()["hits"]
+        with record_statements() as statements:
+            assert authorised_clients[0].get(self.endpoint).json() == jobs
+        assert not [statement for statement in statements if 'FROM "user"' not in statement]  # authentication
+        assert authorised_clients[0].get("/health/cache").json()["hits"] == hits + 1
+
+        # Nested entry written by the user
+        job = next(job for job in jobs if job["interviews"])
+        interview_id = job["interviews"][0]["id"]
+        response = authorised_clients[0].put(f"/interviews/{interview_id}", json={"note": "Cached note"})
+        assert response.status_code == 200
+        jobs = authorised_clients[0].get(self.endpoint).json()
+        interviews = [interview for job in jobs for interview in job["interviews"] if interview["id"] == interview_id]
+        assert interviews[0]["note"] == "Cached note"
+
+        # Table written to by another user
+        authorised_clients[0].get(self.endpoint, params={"view": "min"})
+        assert authorised_clients[1].post(self.endpoint, json={"title": "Other"}).status_code == 201
+        with record_statements() as statements:
+            authorised_clients[0].get(self.endpoint, params={"view": "min"})
+        assert not [statement for statement in statements if 'FROM "user"' not in statement]
+
+    def test_get_all_filter_operators(self, authorised_clients, test_jobs) -> None:
+        """Test the filter operators and multi-column sorting"""
+
+        response = authorised_clients[0].get(
+            self.endpoint, params={"salary_min__gte": 50000, "salary_min__lte": 80000, "order_by": "-salary_min,id"}
+        )
+        assert response.status_code == 200
+        salaries = [job["salary_min"] for job in response.json()]
+        assert salaries and all(50000 <= salary <= 80000 for salary in salaries)
+        assert salaries == sorted(salaries, reverse=True)
+
+        response = authorised_clients[0].get(self.endpoint, params={"id__in": "1,2,3"})
+        assert sorted(job["id"] for job in response.json()) == [1, 2, 3]
+
+        response = authorised_clients[0].get(self.endpoint, params={"title__ilike": "%developer%"})
+        assert response.json() and all("developer" in job["title"].lower() for job in response.json())
+
+        response = authorised_clients[0].get(
+            self.endpoint, params={"deadline__between": "2000-01-01T00:00:00,2100-01-01T00:00:00"}
+        )
+        assert response.json() and all(job["deadline"] is not None for job in response.json())
+
+    def test_get_all_filter_invalid(self, authorised_clients, test_jobs) -> None:
+        """Test invalid filters"""
+
+        for params in ({"salary_min__gte": "abc"}, {"salary_min__like": 1}, {"unknown__gte": 1}, {"id__between": 1}):
+            response = authorised_clients[0].get(self.endpoint, params=params)
+            assert response.status_code == 400
+
+        response = authorised_clients[0].get(self.endpoint, params={"page_size": 2, "order_by": "deadline,title"})
+        assert response.status_code == 400
+
+    def test_get_all_paginated_invalid(self, authorised_clients, test_jobs) -> None:
+        """Test keyset pagination with invalid sort fields and cursors"""
+
+        response = authorised_clients[0].get(self.endpoint, params={"page_size": 2, "order_by": "description"})
+        assert response.status_code == 400
+
+        response = authorised_clients[0].get(self.endpoint, params={"cursor": "invalid"})
+        assert response.status_code == 400
+
+        response = authorised_clients[0].get(self.endpoint, params={"page_size": 2, "order_by": "title"})
+        cursor = response.headers["X-Next-Cursor"]
+        response = authorised_clients[0].get(self.endpoint, params={"cursor": cursor, "order_by": "deadline"})
+        assert response.status_code == 400
+
 
 class TestJobApplicationUpdateCRUD(CRUDTestBase):
     endpoint = "/jobapplicationupdates"
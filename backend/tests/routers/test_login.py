@@ -1,8 +1,10 @@
 import pytest
 from jose import jwt
 
-from app import schemas
+from app import models, schemas
 from app.config import settings
+from app.throttling import email_limiter, ip_limiter
+from app.utils import get_hash_rounds
 
 
 class TestLogin:
@@ -26,6 +28,51 @@ class TestLogin:
         assert login_response.token_type == "bearer"
         assert response.status_code == 200
 
+    def test_login_rehash(self, test_users, client, session, monkeypatch) -> None:
+        """Test that the password is hashed again with the configured cost when a user logs in."""
+
+        monkeypatch.setattr(settings, "bcrypt_rounds", 4)
+        user_data = {"username": test_users[0].email, "password": test_users[0].password}
+        assert client.post("/login", data=user_data).status_code == 200
+
+        user = session.query(models.User).filter(models.User.id == test_users[0].id).first()
+        session.refresh(user)
+        assert get_hash_rounds(user.password) == 4
+        assert client.post("/login", data=user_data).status_code == 200
+
+    def test_login_throttled(self, test_users, client, monkeypatch) -> None:
+        """Test that the login attempts exceeding the email limit are rejected without checking the password."""
+
+        def verify_password(*_args) -> bool:
+            raise AssertionError("Password checked")
+
+        user_data = {"username": test_users[0].email, "password": "wrongpassword"}
+        for _ in range(email_limiter.capacity):
+            assert client.post("/login", data=user_data).status_code == 403
+
+        monkeypatch.setattr("app.hashing.verify_password", verify_password)
+        user_data["username"] = " " + test_users[0].email.upper()
+        response = client.post("/login", data=user_data)
+        assert response.status_code == 429
+        assert int(response.headers["Retry-After"]) > 0
+
+    def test_login_throttled_forwarded(self, test_users, client, monkeypatch) -> None:
+        """Test that the clients behind a trusted proxy are limited by their forwarded address."""
+
+        monkeypatch.setattr(settings, "trusted_proxy_count", 1)
+        monkeypatch.setattr(ip_limiter, "capacity", 1)
+        user_data = {"username": test_users[0].email, "password": test_users[0].password}
+        headers = {"X-Forwarded-For": "1.1.1.1"}
+        assert client.post("/login", data=user_data, headers=headers).status_code == 200
+        assert client.post("/login", data=user_data, headers=headers).status_code == 429
+
+        # A spoofed address before the one appended by the proxy is ignored
+        headers = {"X-Forwarded-For": "2.2.2.2, 1.1.1.1"}
+        assert client.post("/login", data=user_data, headers=headers).status_code == 429
+
+        headers = {"X-Forwarded-For": "3.3.3.3"}
+        assert client.post("/login", data=user_data, headers=headers).status_code == 200
+
     @pytest.mark.parametrize(
         "email, password, status_code",
         [
@@ -0,0 +1,64 @@
+"""Tests for lookup endpoint"""
+
+from app.routers.lookup import LOOKUP_TABLES
+
+
+class TestLookup:
+
+    def test_lookup_names(
+        self,
+        session,
+        authorised_clients,
+        test_users,
+        test_jobs,
+        test_companies,
+        test_locations,
+        test_persons,
+        test_keywords,
+        test_aggregators,
+    ) -> None:
+        """Test that the lookup returns the same display names as the model properties"""
+
+        response = authorised_clients[0].get("/lookup", params={"tables": ",".join(LOOKUP_TABLES)})
+        assert response.status_code == 200
+        data = response.json()
+        assert list(data) == list(LOOKUP_TABLES)
+
+        for table_name, (table_model, name_attribute) in LOOKUP_TABLES.items():
+            entries = session.query(table_model).filter(table_model.owner_id == test_users[0].id).all()
+            expected = {entry.id: getattr(entry, name_attribute) for entry in entries}
+            assert {item["id"]: item["name"] for item in data[table_name]} == expected
+
+    def test_lookup_prefix(self, authorised_clients, test_persons) -> None:
+        """Test the case-insensitive prefix filter and limit"""
+
+        response = authorised_clients[0].get("/lookup", params={"tables": "persons", "prefix": "jo"})
+        assert response.status_code == 200
+        persons = response.json()["persons"]
+        assert persons and all(person["name"].lower().startswith("jo") for person in persons)
+
+        response = authorised_clients[0].get("/lookup", params={"tables": "persons", "prefix": "%"})
+        assert response.json()["persons"] == []
+
+        response = authorised_clients[0].get("/lookup", params={"tables": "persons", "limit": 1})
+        assert len(response.json()["persons"]) == 1
+
+    def test_lookup_other_user(self, authorised_clients, test_users, test_companies) -> None:
+        """Test that only the entries of the current user are returned"""
+
+        response = authorised_clients[1].get("/lookup", params={"tables": "companies"})
+        assert response.status_code == 200
+        owned = [company for company in test_companies if company.owner_id == test_users[1].id]
+        assert len(response.json()["companies"]) == len(owned)
+
+    def test_lookup_unknown_table(self, authorised_clients) -> None:
+        """Test that an unknown table is rejected"""
+
+        response = authorised_clients[0].get("/lookup", params={"tables": "companies,users"})
+        assert response.status_code == 400
+
+    def test_lookup_unauthorised(self, client) -> None:
+        """Test that the lookup requires authentication"""
+
+        response = client.get("/lookup", params={"tables": "companies"})
+        assert response.status_code == 401
@@ -4,9 +4,12 @@ and authentication workflows in the application. These tests ensure that the API
 operations behave as expected under various scenarios, including successful requests and erroneous cases.
 """
 
+import pytest
 from fastapi import status
 
 from app import schemas, models
+from app.routers import user
+from tests.conftest import TestingSessionLocal, record_statements
 
 
 class TestUser:
@@ -20,6 +23,32 @@ class TestUser:
         assert response.status_code == status.HTTP_200_OK
         assert len(response.json()) == len(test_users)
 
+    def test_get_all_users_paginated(self, authorised_clients, test_users) -> None:
+        """Test getting all users one page at a time."""
+
+        ids = []
+        params = {"page_size": 2, "order_by": "-email"}
+        while True:
+            response = authorised_clients[0].get("/users", params=params)
+            assert response.status_code == status.HTTP_200_OK
+            assert len(response.json()) <= 2
+            ids += [user["id"] for user in response.json()]
+            if "X-Next-Cursor" not in response.headers:
+                break
+            params["cursor"] = response.headers["X-Next-Cursor"]
+
+        expected = sorted(test_users, key=lambda user: user.email, reverse=True)
+        assert ids == [user.id for user in expected]
+
+    def test_get_all_users_filtered(self, authorised_clients, test_users) -> None:
+        """Test getting the users matching filters."""
+
+        response = authorised_clients[0].get("/users", params={"is_admin": "true"})
+        assert [user["id"] for user in response.json()] == [user.id for user in test_users if user.is_admin]
+
+        response = authorised_clients[0].get("/users", params={"password__ne": "null"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
     def test_get_all_users_non_admin(self, authorised_clients, test_users) -> None:
         """Test getting all users."""
 
@@ -45,6 +74,19 @@ class TestUser:
         response = authorised_clients[1].get("/users/me")
         assert test_users[1].email == response.json()["email"]
 
+    def test_get_current_user_cached(self, authorised_clients, test_users) -> None:
+        """Test that the authenticated user is read from the cache until it is updated."""
+
+        authorised_clients[1].get("/users/me")
+        with record_statements() as statements:
+            response = authorised_clients[1].get("/users/me")
+        assert response.json()["email"] == test_users[1].email
+        assert statements == []
+
+        response = authorised_clients[0].put(f"/users/{test_users[1].id}", json={"update_limit": 3})
+        assert response.status_code == status.HTTP_200_OK
+        assert authorised_clients[1].get("/users/me").json()["update_limit"] == 3
+
     # ----------------------------------------------------- GET ID -----------------------------------------------------
 
     def test_get_user_by_id(self, authorised_clients, test_users) -> None:
@@ -108,6 +150,13 @@ class TestUser:
         response = authorised_clients[0].put(f"/users/{test_users[0].id}", json=update_data)
         assert response.status_code == 400
 
+    def test_update_different_user_admin_existing_case(self, authorised_clients, test_users, session) -> None:
+        """Test that a user email cannot be changed to the email of another user written in a different case."""
+
+        update_data = {"email": test_users[1].email.upper()}
+        response = authorised_clients[0].put(f"/users/{test_users[0].id}", json=update_data)
+        assert response.status_code == 400
+
     def test_update_different_user_admin_incorrect(self, authorised_clients, test_users, session) -> None:
         """Test successfully updating a different user profile.
         The user password is not needed"""
@@ -219,3 +268,50 @@ class TestUser:
         }
         response = client.post("/users", json=user_data)
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+    def test_create_user_existing_case(self, client, test_users) -> None:
+        """Test that an email cannot be registered twice in different cases."""
+
+        user_data = {"email": test_users[0].email.upper(), "password": "test_password"}
+        response = client.post("/users", json=user_data)
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    @pytest.mark.parametrize(
+        "client_index, method, endpoint, data",
+        [
+            (None, "post", "/users", {"password": "test_password"}),
+            (0, "put", "/users/2", {}),
+            (1, "put", "/users/me", {"current_password": "password2"}),
+        ],
+    )
+    def test_email_registered_concurrently(
+        self, client, authorised_clients, test_users, monkeypatch, client_index, method, endpoint, data
+    ) -> None:
+        """Test that an email registered in a different case by a concurrent request after the email check is
+        rejected."""
+
+        is_email_registered = user.is_email_registered
+
+        def register_concurrently(*args) -> bool:
+            registered = is_email_registered(*args)
+            with TestingSessionLocal() as other_session:
+                other_session.add(models.User(email="Concurrent@Example.com", password="password"))
+                other_session.commit()
+            return registered
+
+        monkeypatch.setattr(user, "is_email_registered", register_concurrently)
+        http_client = client if client_index is None else authorised_clients[client_index]
+        response = http_client.request(method, endpoint, json={"email": "concurrent@example.com", **data})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.json()["detail"] == "Email already registered"
+
+    def test_create_user_allowlist_updated(self, client, authorised_clients, test_settings) -> None:
+        """Test that the cached allowlist is updated when the setting is modified."""
+
+        user_data = {"email": "test_user1@email.com", "password": "test_password"}
+        assert client.post("/users", json=user_data).status_code == status.HTTP_401_UNAUTHORIZED
+
+        allowlist = test_settings[0].value + ",Test_User1@email.com"
+        response = authorised_clients[0].put(f"/settings/{test_settings[0].id}", json={"value": allowlist})
+        assert response.status_code == status.HTTP_200_OK
+        assert client.post("/users", json=user_data).status_code == status.HTTP_201_CREATED
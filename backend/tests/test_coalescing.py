@@ -0,0 +1,71 @@
+"""Tests of the coalescing of identical concurrent requests"""
+
+import threading
+import time
+
+import pytest
+from fastapi import Response
+
+from app.coalescing import SingleFlight
+
+
+def run_concurrently(single_flight: SingleFlight, key: tuple, function, count: int) -> list:
+    """Call the same function from several threads with the same key.
+    :param single_flight: Single-flight registry.
+    :param key: Key of the computation.
+    :param function: Function computing the result.
+    :param count: Number of threads.
+    :return: List of the (result, shared) pairs or exceptions of the threads."""
+
+    results = []
+
+    def call() -> None:
+        try:
+            results.append(single_flight.do(key, function))
+        except Exception as error:
+            results.append(error)
+
+    threads = [threading.Thread(target=call) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestSingleFlight:
+
+    def test_concurrent_calls_are_coalesced(self) -> None:
+        """Test that identical concurrent calls share a single computation"""
+
+        single_flight = SingleFlight()
+        calls = []
+
+        def compute() -> Response:
+            calls.append(1)
+            time.sleep(0.2)
+            return Response(b"[]")
+
+        results = run_concurrently(single_flight, ("jobs",), compute, 5)
+        assert len(calls) == 1
+        assert len({id(result) for result, _ in results}) == 1
+        assert sorted(shared for _, shared in results) == [False, True, True, True, True]
+        assert single_flight.stats() == {"in_flight": 0, "executed": 1, "coalesced": 4}
+
+        # The next call is computed again
+        single_flight.do(("jobs",), compute)
+        assert len(calls) == 2
+
+    def test_errors_are_shared(self) -> None:
+        """Test that the error of a computation is raised to all the callers waiting for it"""
+
+        single_flight = SingleFlight()
+
+        def compute() -> Response:
+            time.sleep(0.2)
+            raise ValueError("Failed")
+
+        results = run_concurrently(single_flight, ("dashboard",), compute, 3)
+        assert all(isinstance(result, ValueError) for result in results)
+        with pytest.raises(ValueError):
+            single_flight.do(("dashboard",), compute)
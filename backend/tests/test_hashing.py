@@ -0,0 +1,76 @@
+import os
+
+import pytest
+from fastapi import HTTPException
+
+from app import utils
+from app.hashing import PasswordPool
+
+
+def crash_process() -> None:
+    """Terminate the current process abruptly, as if it was killed."""
+
+    os._exit(1)
+
+
+def raise_error() -> None:
+    """Raise an error."""
+
+    raise ValueError("Invalid hash")
+
+
+class TestPasswordPool:
+
+    def test_run(self) -> None:
+        """Check that the password operations are run in the pool."""
+
+        pool = PasswordPool(max_workers=1, max_pending=2)
+        try:
+            hashed = pool.run(utils.hash_password, "poolpassword", 4)
+            assert pool.run(utils.verify_password, "poolpassword", hashed)
+            assert pool.stats() == {
+                "workers": 1,
+                "max_pending": 2,
+                "pending": 0,
+                "queued": 0,
+                "completed": 2,
+                "failed": 0,
+                "rejected": 0,
+            }
+        finally:
+            pool.shutdown()
+
+    def test_run_saturated(self) -> None:
+        """Check that the operations are rejected when the pool is saturated."""
+
+        pool = PasswordPool(max_workers=1, max_pending=0)
+        with pytest.raises(HTTPException) as exception:
+            pool.run(utils.hash_password, "poolpassword", 4)
+        assert exception.value.status_code == 503
+        assert pool.stats()["rejected"] == 1
+
+    def test_run_failed(self) -> None:
+        """Check that the failed operations are counted separately from the completed ones."""
+
+        pool = PasswordPool(max_workers=1, max_pending=2)
+        try:
+            with pytest.raises(ValueError):
+                pool.run(raise_error)
+            assert pool.stats()["completed"] == 0
+            assert pool.stats()["failed"] == 1
+        finally:
+            pool.shutdown()
+
+    def test_run_broken(self) -> None:
+        """Check that the pool is replaced after one of its processes died."""
+
+        pool = PasswordPool(max_workers=1, max_pending=2)
+        try:
+            with pytest.raises(HTTPException) as exception:
+                pool.run(crash_process)
+            assert exception.value.status_code == 503
+            assert pool.run(utils.hash_password, "poolpassword", 4)
+            assert pool.stats()["completed"] == 1
+            assert pool.stats()["failed"] == 1
+        finally:
+            pool.shutdown()
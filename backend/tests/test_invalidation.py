@@ -0,0 +1,75 @@
+"""Tests of the cross-worker cache invalidation bus"""
+
+import json
+import select
+import threading
+
+from sqlalchemy import func, select as sql_select
+
+from app import invalidation
+from app.invalidation import CHANNEL, InvalidationListener
+from tests.conftest import engine
+
+
+def receive_notifications(connection, timeout: float = 2.0) -> list[dict]:
+    """Wait for the notifications received by a listening connection.
+    :param connection: psycopg2 connection listening to the invalidation channel.
+    :param timeout: Maximum number of seconds to wait for the first notification.
+    :return: List of notification payloads."""
+
+    select.select([connection], [], [], timeout)
+    connection.poll()
+    payloads = [json.loads(notification.payload) for notification in connection.notifies]
+    connection.notifies.clear()
+    return payloads
+
+
+class TestInvalidation:
+
+    def test_writes_notify_on_commit(self, session, authorised_clients, test_keywords) -> None:
+        """Test that the writes are notified when their transaction is committed, and only then"""
+
+        pool_connection = engine.raw_connection()
+        connection = pool_connection.driver_connection
+        try:
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+
+            response = authorised_clients[0].put(f"/keywords/{test_keywords[0].id}", json={"name": "Notified"})
+            assert response.status_code == 200
+            payloads = receive_notifications(connection)
+            assert {"table": "keyword", "owner_id": test_keywords[0].owner_id, "worker": invalidation.WORKER_ID} in (
+                payloads
+            )
+
+            invalidation.notify(session, "keyword", 1)
+            session.rollback()
+            assert receive_notifications(connection, timeout=0.2) == []
+        finally:
+            connection.autocommit = False
+            pool_connection.close()
+
+    def test_listener_dispatches_other_workers(self, session, monkeypatch) -> None:
+        """Test that the listener passes the notifications of the other workers to the subscribers"""
+
+        received = []
+        event = threading.Event()
+
+        def invalidate(table_name: str, owner_id: int | None) -> None:
+            received.append((table_name, owner_id))
+            event.set()
+
+        monkeypatch.setattr(invalidation, "_subscribers", [(invalidate, lambda: None)])
+        listener = InvalidationListener(engine, poll_interval=0.1)
+        listener.start()
+        try:
+            assert listener.listening.wait(5)
+            for worker in (invalidation.WORKER_ID, "other"):
+                payload = json.dumps({"table": "company", "owner_id": 2, "worker": worker})
+                session.execute(sql_select(func.pg_notify(CHANNEL, payload)))
+                session.commit()
+            assert event.wait(5)
+        finally:
+            listener.stop()
+        assert received == [("company", 2)]
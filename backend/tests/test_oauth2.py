@@ -0,0 +1,42 @@
+import time
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app import oauth2
+from app.config import settings
+
+
+class TestVerifyAccessToken:
+
+    def test_verified_token_cached(self, monkeypatch) -> None:
+        """Check that a verified token is not decoded again."""
+
+        token = oauth2.create_access_token({"user_id": 5})
+        assert oauth2.verify_access_token(token, HTTPException(401)).id == "5"
+
+        def decode(*_args, **_kwargs) -> dict:
+            raise AssertionError("Token decoded again")
+
+        monkeypatch.setattr(oauth2.jwt, "decode", decode)
+        assert oauth2.verify_access_token(token, HTTPException(401)).id == "5"
+
+    def test_expired_token_evicted(self) -> None:
+        """Check that a cached token is rejected once it has expired."""
+
+        expiry = int(time.time()) + 1
+        token = jwt.encode({"user_id": 6, "exp": expiry}, settings.secret_key, algorithm=settings.algorithm)
+        assert oauth2.verify_access_token(token, HTTPException(401)).id == "6"
+
+        time.sleep(expiry + 1 - time.time())  # the expiry is checked to the second
+        with pytest.raises(HTTPException):
+            oauth2.verify_access_token(token, HTTPException(401))
+
+    def test_invalid_token_not_cached(self) -> None:
+        """Check that an invalid token is rejected every time."""
+
+        token = oauth2.create_access_token({"user_id": 7}) + "invalid"
+        for _ in range(2):
+            with pytest.raises(HTTPException):
+                oauth2.verify_access_token(token, HTTPException(401))
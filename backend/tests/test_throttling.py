@@ -0,0 +1,67 @@
+import time
+
+import pytest
+from starlette.requests import Request
+
+from app.config import settings
+from app.throttling import TokenBucketLimiter, get_client_ip
+
+
+class TestTokenBucketLimiter:
+
+    def test_acquire(self) -> None:
+        """Check that a key is limited to the bucket capacity and that the other keys are not affected."""
+
+        limiter = TokenBucketLimiter(3, 1.0)
+        assert [limiter.acquire("a") for _ in range(3)] == [0.0] * 3
+        assert 0 < limiter.acquire("a") <= 1.0
+        assert limiter.acquire("b") == 0.0
+
+    def test_refill(self) -> None:
+        """Check that the tokens are refilled over time."""
+
+        limiter = TokenBucketLimiter(1, 20.0)
+        assert limiter.acquire("a") == 0.0
+        assert limiter.acquire("a") > 0
+        time.sleep(0.1)
+        assert limiter.acquire("a") == 0.0
+
+    def test_sweep(self) -> None:
+        """Check that only the idle buckets are removed."""
+
+        limiter = TokenBucketLimiter(1, 10.0, sweep_interval=0.0)
+        limiter.acquire("a")
+        time.sleep(0.15)
+        limiter.acquire("b")
+        assert len(limiter) == 1
+        limiter.acquire("c")
+        assert len(limiter) == 2
+
+
+class TestGetClientIp:
+
+    @staticmethod
+    def create_request(*forwarded_for: str) -> Request:
+        """Create a request received from 10.0.0.1 with X-Forwarded-For headers.
+        :param forwarded_for: Values of the X-Forwarded-For headers."""
+
+        headers = [(b"x-forwarded-for", value.encode()) for value in forwarded_for]
+        return Request({"type": "http", "headers": headers, "client": ("10.0.0.1", 1234)})
+
+    @pytest.mark.parametrize(
+        "proxy_count, forwarded_for, expected",
+        [
+            (0, ["1.1.1.1"], "10.0.0.1"),
+            (1, [], "10.0.0.1"),
+            (1, ["1.1.1.1"], "1.1.1.1"),
+            (1, ["6.6.6.6, 1.1.1.1"], "1.1.1.1"),
+            (2, ["6.6.6.6, 1.1.1.1, 2.2.2.2"], "1.1.1.1"),
+            (2, ["6.6.6.6", "1.1.1.1, 2.2.2.2"], "1.1.1.1"),
+            (2, ["1.1.1.1"], "10.0.0.1"),
+        ],
+    )
+    def test_get_client_ip(self, monkeypatch, proxy_count, forwarded_for, expected) -> None:
+        """Check that the client address is the one appended by the first trusted proxy."""
+
+        monkeypatch.setattr(settings, "trusted_proxy_count", proxy_count)
+        assert get_client_ip(self.create_request(*forwarded_for)) == expected
@@ -0,0 +1,45 @@
+"""Tests of the removal of the expired tombstones"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+from app import models
+from app.config import settings
+from app.tombstones import TombstonePruner, prune_tombstones
+from tests.conftest import engine
+
+
+def add_tombstones(session) -> None:
+    """Add an expired and a recent tombstone.
+    :param session: Database session."""
+
+    old_date = datetime.now(timezone.utc) - timedelta(days=settings.tombstone_retention_days + 1)
+    session.add(models.Tombstone(table_name="job", entry_id=1000, owner_id=None, created_at=old_date))
+    session.add(models.Tombstone(table_name="job", entry_id=1001, owner_id=None))
+    session.commit()
+
+
+class TestTombstones:
+
+    def test_prune_tombstones(self, session) -> None:
+        """Test that only the tombstones older than the retention period are deleted"""
+
+        add_tombstones(session)
+        assert prune_tombstones(engine) == 1
+        assert session.query(models.Tombstone.entry_id).all() == [(1001,)]
+
+    def test_pruner(self, session) -> None:
+        """Test that the pruner deletes the expired tombstones when started, and then stops"""
+
+        add_tombstones(session)
+        pruner = TombstonePruner(engine, interval=60)
+        pruner.start()
+        try:
+            deadline = time.monotonic() + 5
+            while session.query(models.Tombstone).count() > 1 and time.monotonic() < deadline:
+                session.rollback()
+                time.sleep(0.05)
+        finally:
+            pruner.stop()
+        assert session.query(models.Tombstone.entry_id).all() == [(1001,)]
+        assert pruner.thread is None
@@ -1,4 +1,4 @@
-from app.utils import hash_password, verify_password
+from app.utils import get_hash_rounds, hash_password, verify_password
 
 
 class TestPasswordUtils:
@@ -35,3 +35,9 @@ class TestPasswordUtils:
         assert hash1 != hash2  # because bcrypt adds salt
         assert verify_password(password, hash1)
         assert verify_password(password, hash2)
+
+    def test_hash_rounds(self) -> None:
+        """Check that the cost factor of a hash can be read back."""
+
+        assert get_hash_rounds(hash_password("roundspassword", rounds=4)) == 4
+        assert get_hash_rounds(hash_password("roundspassword")) == 12